@@ -4,16 +4,438 @@ import socket
 import threading
 import time
 import traceback
-import math
 import io
 import contextlib
 import os
 import sys
+import collections
+import enum
+import itertools
+import logging
 import platform
+import queue
+import selectors
+import struct
+import subprocess
 import tempfile
+import uuid
+from concurrent.futures import Future
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional, Tuple, List
 
+try:
+    import orjson  # Optional: much faster (de)serialization of large replies
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec  # Optional: used when orjson isn't available
+except ImportError:
+    msgspec = None
+
+try:
+    import lz4.frame as lz4_frame  # Optional: compresses large messages
+except ImportError:
+    lz4_frame = None
+
+try:
+    import msgpack  # Optional: binary message bodies, cheaper than JSON
+except ImportError:
+    msgpack = None
+
+# Render and screenshot failures go through logging, so their tracebacks
+# are only formatted when a handler at that level is listening
+_log = logging.getLogger("houdinimcp")
+
+# Wire framing: every message is a 4-byte big-endian length followed by a
+# UTF-8 JSON payload. A buffer starting with "{" comes from a legacy client
+# that sends bare JSON; it gets a bare JSON reply.
+_HEADER = struct.Struct('>I')
+_LEGACY_START = ord('{')
+
+# A length word of 0xFFFFFFFF starts a chunked reply: a series of
+# length-prefixed chunks ended by a zero-length chunk. Only replies larger
+# than one chunk are sent this way.
+_STREAM_SENTINEL = _HEADER.pack(0xFFFFFFFF)
+_STREAM_END = _HEADER.pack(0)
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Once a client has agreed to it with "hello", a message body may be LZ4
+# compressed; the top bit of its length word says so. Only bodies of at
+# least _COMPRESS_MIN_SIZE bytes are worth compressing.
+_COMPRESSED_FLAG = 0x80000000
+_COMPRESS_MIN_SIZE = 4096
+
+# Likewise a client may agree to MessagePack bodies instead of JSON. They
+# are used from the message after the hello reply on, in both directions.
+_PACKED_ENCODING = "msgpack"
+
+# Largest request accepted; anything bigger is treated as a broken client
+_MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+
+# Replies such as screenshots can be several megabytes
+_SOCKET_BUFFER_SIZE = 1 << 20
+_RECV_CHUNK_SIZE = 64 * 1024
+_SENDMSG_MAX_BUFFERS = 64  # well under any platform's IOV_MAX
+
+# Friendly names accepted by the create_* and render handlers, mapped to
+# Houdini node types
+_GEO_TYPE_MAP = {
+    "box": "box",
+    "sphere": "sphere",
+    "torus": "torus",
+    "grid": "grid",
+    "tube": "tube",
+    "circle": "circle",
+    "curve": "curve",
+    "line": "line",
+    "platonic": "platonic",
+    "cylinder": "tube",  # Map cylinder to tube
+}
+
+_LIGHT_TYPE_MAP = {
+    "point": "hlight",
+    "spot": "hlight",
+    "directional": "hlight",
+    "area": "hlight",
+    "environment": "envlight",
+}
+
+# hlight "light_type" menu values
+_LIGHT_TYPE_VALUES = {
+    "point": 0,
+    "spot": 1,
+    "directional": 2,
+    "area": 3,
+}
+
+_SIM_TYPE_MAP = {
+    "pyro": "dopnet",
+    "fluid": "dopnet",
+    "cloth": "dopnet",
+    "rigid": "dopnet",
+    "wire": "dopnet",
+    "grains": "dopnet",
+    "flip": "dopnet",
+    "popnet": "popnet",
+    "particles": "popnet",
+    "crowd": "crowdsim",
+}
+
+_RENDERER_ROP_TYPES = {
+    "mantra": "ifd",
+    "karma": "karma",
+    "arnold": "arnold",
+    "redshift": "redshift_rop",
+    "renderman": "renderman_rop",
+}
+
+# Image extensions accepted as-is by render_scene, screenshot_viewport and
+# render_cop; any other path gets the first one appended
+_RENDER_EXTS = (".exr", ".jpg", ".png", ".tif", ".tiff")
+_SCREENSHOT_EXTS = (".png", ".jpg", ".jpeg")
+_COP_EXTS = (".png", ".jpg", ".jpeg", ".exr", ".tif", ".tiff")
+
+# Node types run_simulation accepts (besides any type ending in "sim"), and
+# the ones it can run through their own execute button
+_SIM_NETWORK_TYPES = frozenset(("dopnet", "popnet", "crowdsim"))
+_EXECUTABLE_SIM_TYPES = frozenset(("dopnet", "popnet"))
+
+# Category objects are fetched once; each HOM call returns a new wrapper, so
+# compare them with == rather than "is"
+_SOP_CATEGORY = hou.sopNodeTypeCategory()
+
+# Recently resolved node paths kept by HoudiniMCPServer._node
+_NODE_CACHE_SIZE = 256
+
+# Requests run per Houdini event-loop tick, so a burst can't freeze the UI
+_MAX_REQUESTS_PER_TICK = 16
+
+# Background exports and renders run in a separate hython process on a
+# private copy of the session, so no HOM call ever happens off the main
+# thread. The process is given the copy's path and a JSON job spec, and
+# reports its result on a line starting with _JOB_RESULT_MARKER.
+_JOB_RESULT_MARKER = "houdinimcp-job-result:"
+_JOB_SCRIPT = f"""\
+import json, os, sys
+import hou
+
+hip_path, spec = sys.argv[1], json.loads(sys.argv[2])
+try:
+    hou.hipFile.load(hip_path, suppress_save_prompt=True, ignore_load_warnings=True)
+finally:
+    os.remove(hip_path)  # Only this process reads the copy
+
+method = None
+cop = spec.get("cop")
+if cop:
+    node = hou.node(cop)
+    if hasattr(node, "saveImage"):
+        try:
+            node.saveImage(spec["output"])
+            method = "copernicus_saveImage"
+        except Exception:
+            pass  # fall through to the Composite ROP
+if method is None:
+    hou.node(spec["rop"]).render(verbose=False)
+    if cop:
+        method = "composite_rop"
+print("{_JOB_RESULT_MARKER}" + json.dumps(method))
+"""
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def _dumps(obj) -> bytes:
+        """Serialize a reply to UTF-8 JSON bytes."""
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # e.g. integers wider than 64 bits, which stdlib json accepts
+            return json.dumps(obj).encode('utf-8')
+
+    _loads = orjson.loads
+    _DECODE_ERRORS = (json.JSONDecodeError,)  # orjson's error subclasses it
+elif msgspec is not None:
+    _MSGSPEC_ENCODER = msgspec.json.Encoder()
+
+    def _dumps(obj) -> bytes:
+        """Serialize a reply to UTF-8 JSON bytes."""
+        try:
+            return _MSGSPEC_ENCODER.encode(obj)
+        except (TypeError, OverflowError, msgspec.EncodeError):
+            # e.g. integers wider than 64 bits, which stdlib json accepts
+            return json.dumps(obj).encode('utf-8')
+
+    _loads = msgspec.json.Decoder().decode
+    _DECODE_ERRORS = (msgspec.DecodeError,)
+else:
+    def _dumps(obj) -> bytes:
+        """Serialize a reply to UTF-8 JSON bytes."""
+        return json.dumps(obj).encode('utf-8')
+
+    _loads = json.loads
+    _DECODE_ERRORS = (json.JSONDecodeError,)
+
+# orjson and msgspec encode a whole reply in one fast native call; only the
+# stdlib encoder is slow enough on big results to be worth streaming.
+_ONE_SHOT_ENCODING = orjson is not None or msgspec is not None
+
+
+_STREAM_ENCODER = json.JSONEncoder()
+
+
+def _msgpack_default(obj):
+    """Convert values msgpack doesn't know, e.g. numpy arrays and scalars."""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+
+def _packb(obj) -> bytes:
+    """Serialize a reply as MessagePack."""
+    try:
+        return msgpack.packb(obj, default=_msgpack_default)
+    except (TypeError, ValueError, OverflowError) as e:
+        # e.g. integers wider than 64 bits; the client expects msgpack now
+        return msgpack.packb({"status": "error", "message": f"Could not encode reply: {str(e)}"})
+
+
+def _unpackb(body: bytes):
+    """Parse a MessagePack request body."""
+    return msgpack.unpackb(body, strict_map_key=False)
+
+
+def _frame(body: bytes, compress: bool):
+    """Return the length word for a frame body, and the body to send."""
+    if compress and len(body) >= _COMPRESS_MIN_SIZE:
+        body = lz4_frame.compress(body)
+        return _HEADER.pack(len(body) | _COMPRESSED_FLAG), body
+    return _HEADER.pack(len(body)), body
+
+
+def _encode_reply(obj, framed: bool = True, compress: bool = False, packed: bool = False):
+    """Serialize a reply, yielding the byte strings to send in order.
+
+    orjson and msgspec produce the whole payload in one fast call, so it
+    goes out as a single frame. With only the stdlib encoder the reply is
+    encoded incrementally and yielded in chunks, so a large result never
+    exists as one big string plus its encoded copy. With compress, large
+    frames (or chunks) are LZ4 compressed. With packed, the reply is one
+    MessagePack frame.
+    """
+    if packed or _ONE_SHOT_ENCODING:
+        payload = _packb(obj) if packed else _dumps(obj)
+        if framed:
+            header, payload = _frame(payload, compress)
+            yield header
+        yield payload
+        return
+
+    pending = []
+    pending_size = 0
+    streaming = False
+    # ensure_ascii is on, so character counts equal byte counts
+    for piece in _STREAM_ENCODER.iterencode(obj):
+        pending.append(piece)
+        pending_size += len(piece)
+        if pending_size < _STREAM_CHUNK_SIZE:
+            continue
+        chunk = ''.join(pending).encode('ascii')
+        pending.clear()
+        pending_size = 0
+        if framed:
+            if not streaming:
+                yield _STREAM_SENTINEL
+            header, chunk = _frame(chunk, compress)
+            yield header
+        yield chunk
+        streaming = True
+
+    tail = ''.join(pending).encode('ascii')
+    if framed:
+        if tail or not streaming:
+            # A reply that fit in one chunk is a plain single frame
+            header, tail = _frame(tail, compress)
+            yield header
+        if streaming:
+            if tail:
+                yield tail
+            yield _STREAM_END
+            return
+    if tail:
+        yield tail
+
+
+class _ClientPhase(enum.Enum):
+    """Where a client connection is in its request cycle."""
+    IDLE = "idle"                # nothing buffered
+    READING = "reading"          # part of a message is buffered
+    DISPATCHING = "dispatching"  # a complete message is being handed off
+
+
+class _ClientState:
+    """Per-connection state: receive buffer and output not yet written."""
+
+    def __init__(self, sock, address):
+        self.sock = sock
+        self.address = address
+        self.fd = sock.fileno()
+        self.phase = _ClientPhase.IDLE
+        self.buffer = bytearray()  # Buffer for incomplete data
+        self.outgoing = collections.deque()  # memoryviews awaiting send
+        self.events = selectors.EVENT_READ
+        self.compression = None  # "lz4" once agreed through hello
+        self.encoding = None  # "msgpack" once agreed through hello
+
+
+def _node_summary(node, category: bool = False, position: bool = False) -> Dict[str, Any]:
+    """Describe a node for a reply, fetching each HOM value only once."""
+    ntype = node.type()
+    summary = {
+        "path": node.path(),
+        "name": node.name(),
+        "type": ntype.name(),
+    }
+    if category:
+        summary["category"] = ntype.category().name()
+    if position:
+        pos = node.position()
+        summary["position"] = (pos[0], pos[1])
+    return summary
+
+
+def _parm_templates_by_name(group, templates=None) -> Dict[str, Any]:
+    """Map parm tuple names to templates, descending into folders."""
+    if templates is None:
+        templates = {}
+    for template in group.parmTemplates():
+        if template.type() == hou.parmTemplateType.Folder:
+            _parm_templates_by_name(template, templates)
+        else:
+            templates[template.name()] = template
+    return templates
+
+
+def _parm_holds(parm, value) -> bool:
+    """Return True if setting value on parm (a Parm or ParmTuple) is a no-op."""
+    try:
+        if parm.parmTemplate().type() == hou.parmTemplateType.String:
+            # Compare the raw text: "$HIP/tex.png" or a backtick expression
+            # can evaluate to the requested literal and still differ from it
+            if isinstance(parm, hou.ParmTuple):
+                current = tuple(component.unexpandedString() for component in parm)
+            else:
+                current = parm.unexpandedString()
+        else:
+            current = parm.eval()
+        if current != value:
+            return False
+        # Setting a constant over keyframes or an expression still changes it
+        if isinstance(parm, hou.ParmTuple):
+            return not any(component.keyframes() for component in parm)
+        return not parm.keyframes()
+    except Exception:
+        return False
+
+
+@contextlib.contextmanager
+def _manual_update_mode():
+    """Hold off cooking and viewport refreshes until the block exits."""
+    previous = hou.updateModeSetting()
+    if previous == hou.updateMode.Manual:
+        yield
+        return
+    hou.setUpdateMode(hou.updateMode.Manual)
+    try:
+        yield
+    finally:
+        hou.setUpdateMode(previous)
+
+
+@contextlib.contextmanager
+def _batch_scene_edit():
+    """Apply render setup edits without recooks or undo entries."""
+    with _manual_update_mode(), hou.undos.disabler():
+        yield
+
+
+# Shelf tool name -> hou.Tool (or None). hou.shelves.tools() rebuilds its dict
+# from every loaded shelf on each call, so look each tool up only once.
+_shelf_tool_cache: Dict[str, Any] = {}
+
+
+def _shelf_tool(name: str):
+    """Return the named shelf tool, or None if no shelf provides it."""
+    if name not in _shelf_tool_cache:
+        _shelf_tool_cache[name] = hou.shelves.tools().get(name)
+    return _shelf_tool_cache[name]
+
+
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+def _is_json_safe(value, depth: int = 32) -> bool:
+    """Return True if json can encode value as-is, without encoding it.
+
+    Containers nested deeper than depth (including reference cycles) are
+    reported as unsafe.
+    """
+    if isinstance(value, _JSON_SCALARS):
+        return True
+    if depth <= 0:
+        return False
+    if isinstance(value, (list, tuple)):
+        return all(_is_json_safe(item, depth - 1) for item in value)
+    if isinstance(value, dict):
+        return all(
+            isinstance(key, _JSON_SCALARS) and _is_json_safe(item, depth - 1)
+            for key, item in value.items()
+        )
+    return False
+
+
 def _get_port_file_dir():
     """Get the platform-appropriate directory for port files."""
     if sys.platform == 'win32':
@@ -24,20 +446,32 @@ def _get_port_file_dir():
         return os.path.join(base, 'houdinimcp', 'instances')
 
 
-def _is_pid_alive(pid):
-    """Check if a process with the given PID is still running."""
-    if sys.platform == 'win32':
+if sys.platform == 'win32':
+    import ctypes
+    from ctypes import wintypes
+
+    # Resolve the kernel32 entry points once, with explicit signatures
+    _PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    _OpenProcess = ctypes.windll.kernel32.OpenProcess
+    _OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    _OpenProcess.restype = wintypes.HANDLE
+    _CloseHandle = ctypes.windll.kernel32.CloseHandle
+    _CloseHandle.argtypes = (wintypes.HANDLE,)
+    _CloseHandle.restype = wintypes.BOOL
+
+    def _is_pid_alive(pid):
+        """Check if a process with the given PID is still running."""
         try:
-            import ctypes
-            PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
-            handle = ctypes.windll.kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
-            if handle:
-                ctypes.windll.kernel32.CloseHandle(handle)
-                return True
-            return False
+            handle = _OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
         except Exception:
             return False
-    else:
+        if not handle:
+            return False
+        _CloseHandle(handle)
+        return True
+else:
+    def _is_pid_alive(pid):
+        """Check if a process with the given PID is still running."""
         try:
             os.kill(pid, 0)
             return True
@@ -48,43 +482,112 @@ def _is_pid_alive(pid):
 class HoudiniMCPServer:
     DEFAULT_PORT_RANGE = (9877, 9886)
 
+    # Command names accepted by execute_command, each mapped to the method of
+    # the same name. The lookup table is built once per class, not per call.
+    _HANDLER_NAMES = (
+        "ping",
+        "batch",
+        "get_scene_info",
+        "create_node",
+        "modify_node",
+        "delete_node",
+        "get_node_info",
+        "execute_code",
+        "set_parameter",
+        "create_geometry",
+        "layout_network",
+        "connect_nodes",
+        "set_material",
+        "create_subnet",
+        "create_digital_asset",
+        "get_parameter_info",
+        "save_hip",
+        "load_hip",
+        "create_camera",
+        "create_light",
+        "create_sim",
+        "run_simulation",
+        "export_fbx",
+        "export_abc",
+        "export_usd",
+        "get_job_status",
+        "render_scene",
+        "render_scene_multi",
+        "screenshot_viewport",
+        "check_screenshot",
+        "render_cop",
+    )
+    _HANDLERS = None
+
+    # Port files held by servers running in this process
+    _owned_port_files = set()
+
+    # Parameter types whose evaluated value is already JSON-friendly; any
+    # other type is stringified by _get_parameter_value.
+    _PARM_EVALUATORS = {
+        hou.parmTemplateType.Float: hou.Parm.eval,
+        hou.parmTemplateType.Int: hou.Parm.eval,
+        hou.parmTemplateType.String: hou.Parm.eval,
+        hou.parmTemplateType.Toggle: lambda parm: bool(parm.eval()),
+        hou.parmTemplateType.Menu: hou.Parm.eval,
+    }
+
     def __init__(self, host='localhost', port=None, port_range=None):
         self.host = host
         self.port = port  # None means auto-detect from range
         self.port_range = port_range or self.DEFAULT_PORT_RANGE
         self.running = False
         self.socket = None
-        self.client = None
-        self.buffer = b''  # Buffer for incomplete data
+        self._clients = {}  # fd -> _ClientState for every connected client
+        # Fixed scratch area recv_into() fills, so reads allocate nothing
+        self._recv_view = memoryview(bytearray(_RECV_CHUNK_SIZE))
         self.thread = None
         self._port_file_path = None
+        self._selector = None
+        self._wake_recv = None  # stop() writes to _wake_send to end select()
+        self._wake_send = None
+        # With a UI, handlers run on Houdini's main thread: the I/O thread
+        # queues parsed requests, an event-loop callback runs them and queues
+        # the replies, and the I/O thread encodes and sends those.
+        self._requests = queue.SimpleQueue()
+        self._replies = queue.SimpleQueue()
+        self._drain_callback = None
+        self._node_cache = collections.OrderedDict()  # path -> hou.Node, LRU order
+        self._temp_dir = None  # $TEMP, expanded on first use
+        self._rop_cache = {}  # ROP type -> export ROP kept in /out/houdinimcp_cache
+        self._render_rop_paths = {}  # ROP type -> path of the ROP render_scene last used
+        self._out_context = None  # the /out network, once looked up or created
+        self._jobs = {}  # job id -> (Popen, log path), until get_job_status reports it finished
+        self._job_script_path = None  # _JOB_SCRIPT, written to $TEMP on first use
+        self._screenshots = {}  # file path -> (Future, reply) for deferred screenshots
+        self._hip_callback = None
     
-    def _clean_stale_port_files(self):
-        """Remove port files for processes that are no longer running."""
-        port_dir = _get_port_file_dir()
-        if not os.path.isdir(port_dir):
-            return
-        for fname in os.listdir(port_dir):
-            if not fname.startswith('houdini_') or not fname.endswith('.json'):
-                continue
-            fpath = os.path.join(port_dir, fname)
-            try:
-                with open(fpath, 'r') as f:
-                    info = json.load(f)
-                pid = info.get('pid')
-                if pid and not _is_pid_alive(pid):
-                    os.remove(fpath)
-                    print(f"[HoudiniMCP] Cleaned stale port file: {fname}")
-            except Exception:
-                pass
+    def _claim_port_file(self, port) -> bool:
+        """Create the port file for port, unless another live instance owns it.
 
-    def _write_port_file(self):
-        """Write a port file advertising this instance."""
+        The file is created with O_CREAT | O_EXCL before binding, so two
+        Houdini sessions starting together can't both claim the same port.
+        A file left behind by a dead process is removed and claimed.
+        """
         port_dir = _get_port_file_dir()
         os.makedirs(port_dir, exist_ok=True)
+        port_file = os.path.join(port_dir, f'houdini_{port}.json')
+
+        flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, 'O_BINARY', 0)
+        try:
+            fd = os.open(port_file, flags, 0o644)
+        except FileExistsError:
+            if not self._port_file_is_stale(port_file):
+                return False
+            try:
+                os.remove(port_file)
+                print(f"[HoudiniMCP] Cleaned stale port file: {os.path.basename(port_file)}")
+                fd = os.open(port_file, flags, 0o644)
+            except OSError:
+                return False  # Lost the race to another instance
 
         info = {
-            'port': self.port,
+            'port': port,
             'pid': os.getpid(),
             'hip_file': hou.hipFile.path(),
             'hip_name': hou.hipFile.basename(),
@@ -92,18 +595,38 @@ class HoudiniMCPServer:
             'started_at': datetime.now(timezone.utc).isoformat(),
             'hostname': self.host,
         }
-
-        port_file = os.path.join(port_dir, f'houdini_{self.port}.json')
-        tmp_file = port_file + '.tmp'
-        with open(tmp_file, 'w') as f:
-            json.dump(info, f, indent=2)
-        os.replace(tmp_file, port_file)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(json.dumps(info, indent=2).encode('utf-8'))
         self._port_file_path = port_file
+        self._owned_port_files.add(port_file)
         print(f"[HoudiniMCP] Port file written: {port_file}")
+        return True
+
+    @classmethod
+    def _port_file_is_stale(cls, port_file) -> bool:
+        """Return True if port_file was left behind by a process that's gone."""
+        try:
+            with open(port_file, 'rb') as f:
+                info = _loads(f.read())
+            pid = info.get('pid')
+        except Exception:
+            # Possibly still being written by its owner; only a file that
+            # has stayed unreadable for a while counts as abandoned.
+            try:
+                return time.time() - os.path.getmtime(port_file) > 10
+            except OSError:
+                return False
+        if not pid:
+            return False
+        if pid == os.getpid():
+            # Left by an earlier server in this session that didn't clean up
+            return port_file not in cls._owned_port_files
+        return not _is_pid_alive(pid)
 
     def _remove_port_file(self):
         """Remove this instance's port file."""
         if self._port_file_path:
+            self._owned_port_files.discard(self._port_file_path)
             try:
                 os.remove(self._port_file_path)
                 print(f"[HoudiniMCP] Port file removed: {self._port_file_path}")
@@ -113,7 +636,6 @@ class HoudiniMCPServer:
 
     def start(self):
         """Start the Houdini MCP server"""
-        self._clean_stale_port_files()
         self.running = True
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
@@ -121,27 +643,47 @@ class HoudiniMCPServer:
         try:
             if self.port is not None:
                 # Explicit port — try only that one
+                if not self._claim_port_file(self.port):
+                    raise OSError(f"Port {self.port} is claimed by another Houdini instance")
                 self.socket.bind((self.host, self.port))
             else:
-                # Auto-detect: try each port in the range
+                # Auto-detect: claim the first port whose file we can create
+                # and whose socket we can bind
                 bound = False
                 for p in range(self.port_range[0], self.port_range[1] + 1):
+                    if not self._claim_port_file(p):
+                        continue
                     try:
                         self.socket.bind((self.host, p))
-                        self.port = p
-                        bound = True
-                        break
                     except OSError:
+                        self._remove_port_file()
                         continue
+                    self.port = p
+                    bound = True
+                    break
                 if not bound:
                     raise OSError(
                         f"All ports in range {self.port_range[0]}-{self.port_range[1]} are in use"
                     )
 
-            self.socket.listen(1)
+            self.socket.listen(socket.SOMAXCONN)
+            self.socket.setblocking(False)
 
-            # Write port file so the MCP server can discover us
-            self._write_port_file()
+            # Block in select() on the listener plus a wake-up socket instead
+            # of polling with timeouts; stop() writes to the wake-up socket.
+            self._selector = selectors.DefaultSelector()
+            self._wake_recv, self._wake_send = socket.socketpair()
+            self._wake_recv.setblocking(False)
+            self._selector.register(self.socket, selectors.EVENT_READ)
+            self._selector.register(self._wake_recv, selectors.EVENT_READ)
+
+            if hou.isUIAvailable():
+                self._drain_callback = self._drain_requests
+                hou.ui.addEventLoopCallback(self._drain_callback)
+
+            # Scene-derived caches are dropped whenever the hip file changes
+            self._hip_callback = self._on_hip_file_event
+            hou.hipFile.addEventCallback(self._hip_callback)
 
             # Start server in a separate thread
             self.thread = threading.Thread(target=self._run_server)
@@ -160,121 +702,308 @@ class HoudiniMCPServer:
         self._remove_port_file()
         self.running = False
 
+        if self._drain_callback:
+            try:
+                hou.ui.removeEventLoopCallback(self._drain_callback)
+            except Exception:
+                pass
+            self._drain_callback = None
+
+        if self._hip_callback:
+            try:
+                hou.hipFile.removeEventCallback(self._hip_callback)
+            except Exception:
+                pass
+            self._hip_callback = None
+
+        if self._wake_send:
+            try:
+                self._wake_send.send(b'\0')
+            except OSError:
+                pass
+
         if self.thread:
             self.thread.join(timeout=1.0)
             self.thread = None
 
-        if self.socket:
-            self.socket.close()
-        if self.client:
-            self.client.close()
+        if self._selector:
+            self._selector.close()
+        for client in self._clients.values():
+            client.sock.close()
+        for sock in (self.socket, self._wake_recv, self._wake_send):
+            if sock:
+                sock.close()
 
+        self._selector = None
         self.socket = None
-        self.client = None
+        self._clients.clear()
+        self._wake_recv = None
+        self._wake_send = None
         print("HoudiniMCP server stopped")
     
     def _run_server(self):
         """Main server loop"""
-        self.socket.settimeout(0.5)  # Use a timeout for checking running state
-        
         while self.running:
             try:
-                # Accept new connections
-                if not self.client:
-                    try:
-                        self.client, address = self.socket.accept()
-                        print(f"Connected to client: {address}")
-                    except socket.timeout:
-                        continue  # No connection waiting
-                    except Exception as e:
-                        print(f"Error accepting connection: {str(e)}")
-                        continue
-                
-                # Process existing connection
-                if self.client:
-                    try:
-                        self.client.settimeout(0.5)  # Small timeout for recv
-                        try:
-                            data = self.client.recv(8192)
-                            if data:
-                                self.buffer += data
-                                # Try to process complete messages
-                                try:
-                                    # Attempt to parse the buffer as JSON
-                                    command = json.loads(self.buffer.decode('utf-8'))
-                                    # If successful, clear the buffer and process command
-                                    self.buffer = b''
-                                    response = self.execute_command(command)
-                                    response_json = json.dumps(response)
-                                    self.client.sendall(response_json.encode('utf-8'))
-                                except json.JSONDecodeError:
-                                    # Incomplete data, keep in buffer
-                                    pass
-                            else:
-                                # Connection closed by client
-                                print("Client disconnected")
-                                self.client.close()
-                                self.client = None
-                                self.buffer = b''
-                        except socket.timeout:
-                            pass  # No data available
-                        except Exception as e:
-                            print(f"Error receiving data: {str(e)}")
-                            self.client.close()
-                            self.client = None
-                            self.buffer = b''
-                    except Exception as e:
-                        print(f"Error with client: {str(e)}")
-                        if self.client:
-                            self.client.close()
-                            self.client = None
-                        self.buffer = b''
+                events = self._selector.select()
             except Exception as e:
                 print(f"Server error: {str(e)}")
+                break
+
+            for key, mask in events:
+                sock = key.fileobj
+                if sock is self._wake_recv:
+                    try:
+                        self._wake_recv.recv(4096)
+                    except OSError:
+                        pass
+                    self._flush_replies()
+                elif sock is self.socket:
+                    self._accept_client()
+                else:
+                    client = key.data
+                    if mask & selectors.EVENT_WRITE:
+                        self._write_client(client)
+                    if mask & selectors.EVENT_READ and self._clients.get(client.fd) is client:
+                        self._read_client(client)
         
         print("Server loop exited")
 
+    def _accept_client(self):
+        """Accept a pending connection and start watching it for data."""
+        try:
+            sock, address = self.socket.accept()
+        except BlockingIOError:
+            return
+        except Exception as e:
+            print(f"Error accepting connection: {str(e)}")
+            return
+
+        sock.setblocking(False)
+        self._tune_client_socket(sock)
+        client = _ClientState(sock, address)
+        self._clients[client.fd] = client
+        self._selector.register(sock, client.events, client)
+        print(f"Connected to client: {address}")
+
+    @staticmethod
+    def _tune_client_socket(sock):
+        """Configure an accepted socket for request/response traffic."""
+        try:
+            # Replies are written in one go; don't let Nagle hold them back
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if hasattr(socket, 'TCP_QUICKACK'):  # Linux only
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, _SOCKET_BUFFER_SIZE)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _SOCKET_BUFFER_SIZE)
+        except OSError as e:
+            print(f"Could not tune client socket: {str(e)}")
+
+    def _read_client(self, client):
+        """Read whatever the client has sent and dispatch complete messages."""
+        try:
+            received = client.sock.recv_into(self._recv_view)
+            if not received:
+                # Connection closed by client
+                print(f"Client disconnected: {client.address}")
+                self._drop_client(client)
+                return
+            client.buffer.extend(self._recv_view[:received])
+            self._process_buffer(client)
+        except (BlockingIOError, InterruptedError):
+            pass
+        except Exception as e:
+            print(f"Error while {client.phase.value} from {client.address}: {str(e)}")
+            self._drop_client(client)
+
+    def _drop_client(self, client):
+        """Close a client connection and forget its state."""
+        if self._clients.pop(client.fd, None) is None:
+            return
+        try:
+            self._selector.unregister(client.sock)
+        except Exception:
+            pass
+        client.sock.close()
+        client.buffer.clear()
+        client.outgoing.clear()
+
+    def _process_buffer(self, client):
+        """Dispatch every complete message held in a client's receive buffer.
+
+        Raises ValueError for a message over _MAX_MESSAGE_SIZE; the caller
+        drops the client.
+        """
+        buffer = client.buffer
+        while buffer:
+            client.phase = _ClientPhase.READING
+            if buffer[0] == _LEGACY_START:
+                # Legacy client: no length prefix, wait until the JSON parses
+                try:
+                    command = _loads(buffer)
+                except _DECODE_ERRORS:
+                    if len(buffer) > _MAX_MESSAGE_SIZE:
+                        raise ValueError("Unterminated legacy message exceeds size limit")
+                    return  # Incomplete data, keep in buffer
+                buffer.clear()
+                framed = False
+            else:
+                if len(buffer) < _HEADER.size:
+                    return
+                (length,) = _HEADER.unpack_from(buffer)
+                compressed = client.compression is not None and length & _COMPRESSED_FLAG
+                if compressed:
+                    length &= ~_COMPRESSED_FLAG
+                if length > _MAX_MESSAGE_SIZE:
+                    raise ValueError(f"Message of {length} bytes exceeds size limit")
+                end = _HEADER.size + length
+                if len(buffer) < end:
+                    return  # Incomplete message, keep in buffer
+
+                # Parse each message exactly once, then drop it from the buffer
+                body = bytes(buffer[_HEADER.size:end])
+                del buffer[:end]
+                if compressed:
+                    body = lz4_frame.decompress(body)
+                command = _unpackb(body) if client.encoding else _loads(body)
+                framed = True
+
+            client.phase = _ClientPhase.DISPATCHING
+            if command.get("type") == "hello":
+                # Connection setup, answered right here on the I/O thread.
+                # Clients send it as bare JSON, since they can't know yet
+                # whether this addon reads frames; the reply comes back the
+                # same way, and an agreed encoding starts with the next message.
+                reply = self._hello(client, command.get("params") or {})
+                self._send_reply(client, reply, framed)
+                client.encoding = reply["result"]["encoding"]
+                continue
+            if command.get("type") == "ping":
+                # Liveness check, also answered on the I/O thread: a main
+                # thread busy with a render or a long execute_code must not
+                # make a healthy addon look dead
+                self._send_reply(client, {"status": "success", "result": self.ping()}, framed)
+                continue
+            self._dispatch(client, command, framed)
+        client.phase = _ClientPhase.IDLE
+
+    @staticmethod
+    def _hello(client, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Agree on optional wire features with a newly connected client.
+
+        "framing": True in the reply tells the client it may send
+        length-prefixed frames from now on.
+        """
+        offered = params.get("compression") or ()
+        client.compression = "lz4" if lz4_frame is not None and "lz4" in offered else None
+        encoding = None
+        if msgpack is not None and _PACKED_ENCODING in (params.get("encoding") or ()):
+            encoding = _PACKED_ENCODING
+        return {"status": "success",
+                "result": {"framing": True, "compression": client.compression,
+                           "encoding": encoding}}
+
+    def _dispatch(self, client, command: Dict[str, Any], framed: bool):
+        """Run a parsed command, on the main thread when Houdini has a UI."""
+        if self._drain_callback is None:
+            # No event loop (hython): run inline on the I/O thread
+            self._send_reply(client, self.execute_command(command), framed)
+        else:
+            self._requests.put((client, command, framed))
+
+    def _drain_requests(self):
+        """Event-loop callback: run queued commands on Houdini's main thread."""
+        handled = 0
+        while handled < _MAX_REQUESTS_PER_TICK:
+            try:
+                client, command, framed = self._requests.get_nowait()
+            except queue.Empty:
+                break
+            self._replies.put((client, self.execute_command(command), framed))
+            handled += 1
+        if handled and self._wake_send:
+            try:
+                self._wake_send.send(b'\1')  # Let the I/O thread send the replies
+            except OSError:
+                pass
+
+    def _flush_replies(self):
+        """Encode and send replies produced on the main thread."""
+        while True:
+            try:
+                client, response, framed = self._replies.get_nowait()
+            except queue.Empty:
+                return
+            if self._clients.get(client.fd) is not client:
+                continue  # The requester has disconnected
+            try:
+                self._send_reply(client, response, framed)
+            except Exception as e:
+                print(f"Error sending response: {str(e)}")
+                self._drop_client(client)
+
+    def _send_reply(self, client, response: Dict[str, Any], framed: bool):
+        """Queue an encoded reply, writing each piece as soon as it's ready."""
+        for part in _encode_reply(response, framed, client.compression is not None,
+                                  client.encoding is not None):
+            client.outgoing.append(memoryview(part))
+            self._write_client(client)
+
+    def _write_client(self, client):
+        """Write as much queued output as the socket takes without blocking.
+
+        Whatever is left is sent once select() reports the socket writable,
+        so one slow reader never holds up the other clients.
+        """
+        sock = client.sock
+        outgoing = client.outgoing
+        try:
+            while outgoing:
+                if hasattr(sock, 'sendmsg'):
+                    # Scatter-gather write of several queued pieces at once
+                    sent = sock.sendmsg(list(itertools.islice(outgoing, _SENDMSG_MAX_BUFFERS)))
+                else:
+                    sent = sock.send(outgoing[0])  # Windows has no sendmsg
+                while sent:
+                    if sent >= len(outgoing[0]):
+                        sent -= len(outgoing.popleft())
+                    else:
+                        outgoing[0] = outgoing[0][sent:]
+                        sent = 0
+        except (BlockingIOError, InterruptedError):
+            pass
+        except Exception as e:
+            print(f"Error sending response: {str(e)}")
+            self._drop_client(client)
+            return
+
+        events = selectors.EVENT_READ
+        if outgoing:
+            events |= selectors.EVENT_WRITE
+        if events != client.events:
+            client.events = events
+            self._selector.modify(sock, events, client)
+
+    @classmethod
+    def _handler_table(cls) -> Dict[str, Any]:
+        """Return the command-name -> unbound handler map, building it on first use."""
+        table = cls.__dict__.get("_HANDLERS")
+        if table is None:
+            table = {name: getattr(cls, name) for name in cls._HANDLER_NAMES}
+            cls._HANDLERS = table
+        return table
+
     def execute_command(self, command: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a command from the client"""
         try:
             cmd_type = command.get("type")
             params = command.get("params", {})
             
-            # Register all command handlers
-            handlers = {
-                "get_scene_info": self.get_scene_info,
-                "create_node": self.create_node,
-                "modify_node": self.modify_node,
-                "delete_node": self.delete_node,
-                "get_node_info": self.get_node_info,
-                "execute_code": self.execute_code,
-                "set_parameter": self.set_parameter,
-                "create_geometry": self.create_geometry,
-                "layout_network": self.layout_network,
-                "connect_nodes": self.connect_nodes,
-                "set_material": self.set_material,
-                "create_subnet": self.create_subnet,
-                "create_digital_asset": self.create_digital_asset,
-                "get_parameter_info": self.get_parameter_info,
-                "save_hip": self.save_hip,
-                "load_hip": self.load_hip,
-                "create_camera": self.create_camera,
-                "create_light": self.create_light,
-                "create_sim": self.create_sim,
-                "run_simulation": self.run_simulation,
-                "export_fbx": self.export_fbx,
-                "export_abc": self.export_abc,
-                "export_usd": self.export_usd,
-                "render_scene": self.render_scene,
-                "screenshot_viewport": self.screenshot_viewport,
-                "render_cop": self.render_cop,
-            }
-            
-            handler = handlers.get(cmd_type)
+            handler = self._handler_table().get(cmd_type)
             if handler:
                 try:
                     print(f"Executing handler for {cmd_type}")
-                    result = handler(**params)
+                    result = handler(self, **params)
                     print(f"Handler execution complete")
                     return {"status": "success", "result": result}
                 except Exception as e:
@@ -288,30 +1017,150 @@ class HoudiniMCPServer:
             traceback.print_exc()
             return {"status": "error", "message": str(e)}
 
+    def _on_hip_file_event(self, event_type):
+        """Drop cached scene state after a hip file is loaded or cleared."""
+        if event_type in (hou.hipFileEventType.AfterLoad, hou.hipFileEventType.AfterClear):
+            self._node_cache.clear()
+            self._rop_cache.clear()
+            self._render_rop_paths.clear()
+            self._out_context = None
+            self._temp_dir = None
+
+    def _get_temp_dir(self) -> str:
+        """Return $TEMP, expanding it only once per scene."""
+        if self._temp_dir is None:
+            self._temp_dir = hou.expandString("$TEMP")
+        return self._temp_dir
+
+    def _node(self, path: str):
+        """Resolve a node path like hou.node(), reusing recent lookups.
+
+        A cached node is only returned while it still exists at that path,
+        so deleted or renamed nodes fall through to a fresh lookup.
+        """
+        node = self._node_cache.get(path)
+        if node is not None:
+            try:
+                if node.path() == path:
+                    self._node_cache.move_to_end(path)
+                    return node
+            except hou.ObjectWasDeleted:
+                pass
+            del self._node_cache[path]
+
+        node = hou.node(path)
+        if node is not None:
+            self._node_cache[path] = node
+            if len(self._node_cache) > _NODE_CACHE_SIZE:
+                self._node_cache.popitem(last=False)
+        return node
+
+    def _get_out_context(self):
+        """Return the /out network, creating it if the scene has none."""
+        out = self._out_context
+        if out is not None:
+            try:
+                out.path()
+                return out
+            except hou.ObjectWasDeleted:
+                pass
+
+        out = hou.node("/out") or hou.node("/").createNode("out")
+        self._out_context = out
+        return out
+
+    def ping(self) -> Dict[str, Any]:
+        """Answer a liveness check without touching the scene"""
+        return {"pong": True}
+
+    @staticmethod
+    def _batch_failed(reply: Dict[str, Any]) -> bool:
+        """Whether a batch entry's reply reports a failure."""
+        return reply.get("status") == "error" or (
+            isinstance(reply.get("result"), dict) and "error" in reply["result"])
+
+    @classmethod
+    def _resolve_refs(cls, value, replies: List[Dict[str, Any]]):
+        """Replace {"__ref": i} (optionally with "key") by the result of entry i.
+
+        Raises ValueError for a reference to a later, missing or failed entry.
+        """
+        if isinstance(value, dict):
+            if "__ref" in value:
+                index = value["__ref"]
+                if not isinstance(index, int) or not 0 <= index < len(replies):
+                    raise ValueError(f"INVALID_ARGUMENT: no earlier result {index!r} to refer to")
+                if cls._batch_failed(replies[index]):
+                    raise ValueError(f"INVALID_ARGUMENT: result {index} is from a failed command")
+                result = replies[index].get("result")
+                key = value.get("key")
+                if key is None:
+                    return result
+                if not isinstance(result, dict) or key not in result:
+                    raise ValueError(f"INVALID_ARGUMENT: result {index} has no {key!r}")
+                return result[key]
+            return {k: cls._resolve_refs(v, replies) for k, v in value.items()}
+        if isinstance(value, list):
+            return [cls._resolve_refs(v, replies) for v in value]
+        return value
+
+    def batch(self, commands: List[Dict[str, Any]], stop_on_error: bool = True) -> Dict[str, Any]:
+        """Run several commands in one request, as one undo step.
+
+        Each entry is a {"type", "params"} command and gets the reply
+        execute_command would have sent for it. A parameter value of
+        {"__ref": i} is replaced by entry i's result, or {"__ref": i,
+        "key": k} by one field of it, so later commands can use what
+        earlier ones made. An entry whose reference can't be resolved
+        fails with INVALID_ARGUMENT. With stop_on_error, the first failing
+        command ends the batch.
+        """
+        results = []
+        with hou.undos.group("HoudiniMCP: Batch"):
+            for command in commands:
+                try:
+                    params = self._resolve_refs(command.get("params") or {}, results)
+                except ValueError as e:
+                    reply = {"status": "error", "message": str(e)}
+                else:
+                    reply = self.execute_command({"type": command.get("type"), "params": params})
+                results.append(reply)
+                if stop_on_error and self._batch_failed(reply):
+                    break
+        return {"results": results, "completed": len(results), "total": len(commands)}
+
     def get_scene_info(self) -> Dict[str, Any]:
         """Get information about the current Houdini scene"""
         try:
+            root = self._node("/")
+
             # Basic scene info
             scene_info = {
                 "hip_file": hou.hipFile.path(),
                 "name": hou.hipFile.basename(),
                 "modified": hou.hipFile.hasUnsavedChanges(),
                 "fps": hou.fps(),
-                "frame_range": list(hou.playbar.frameRange()),
+                "frame_range": hou.playbar.frameRange(),
                 "current_frame": hou.frame(),
-                "node_count": len(hou.node("/").allSubChildren()),
+                "node_count": 0,
                 "top_level_nodes": []
             }
             
-            # Get top-level nodes
-            for node in hou.node("/").children():
+            # Get top-level nodes. Every node lives under exactly one of them,
+            # so their subtree sizes add up to the scene total without a
+            # second walk of the whole hierarchy.
+            node_count = 0
+            for node in root.children():
+                child_count = len(node.allSubChildren())
+                node_count += child_count + 1
                 node_info = {
                     "name": node.name(),
                     "type": node.type().name(),
                     "path": node.path(),
-                    "child_count": len(node.allSubChildren()),
+                    "child_count": child_count,
                 }
                 scene_info["top_level_nodes"].append(node_info)
+            scene_info["node_count"] = node_count
             
             return scene_info
         except Exception as e:
@@ -322,20 +1171,27 @@ class HoudiniMCPServer:
     def get_node_info(self, path: str) -> Dict[str, Any]:
         """Get detailed information about a specific node"""
         try:
-            node = hou.node(path)
+            node = self._node(path)
             if not node:
                 raise ValueError(f"Node not found: {path}")
             
+            # Each HOM call crosses into C++, so fetch shared values once
+            ntype = node.type()
+            category = ntype.category().name()
+            pos = node.position()
+            children = node.children()
+            parm_tuples = node.parmTuples()
+
             # Basic node info - use try/except for methods that may not exist on all node types
             node_info = {
                 "name": node.name(),
-                "type": node.type().name(),
-                "category": node.type().category().name(),
+                "type": ntype.name(),
+                "category": category,
                 "path": node.path(),
-                "position": [node.position()[0], node.position()[1]],
-                "child_count": len(node.children()),
-                "children": [child.name() for child in node.children()],
-                "parameter_count": len(node.parms()),
+                "position": (pos[0], pos[1]),
+                "child_count": len(children),
+                "children": tuple(child.name() for child in children),
+                "parameter_count": len(parm_tuples),
                 "parameters": {},
             }
 
@@ -361,47 +1217,54 @@ class HoudiniMCPServer:
                 node_info["is_selectable"] = None
 
             try:
-                node_info["color"] = list(node.color().rgb())
+                node_info["color"] = node.color().rgb()
             except Exception:
                 node_info["color"] = None
 
             try:
                 errs = node.errors()
                 node_info["has_errors"] = len(errs) > 0
-                node_info["errors"] = list(errs)
+                node_info["errors"] = errs
             except Exception:
                 node_info["has_errors"] = False
-                node_info["errors"] = []
+                node_info["errors"] = ()
 
             try:
-                node_info["inputs"] = [input_node.path() if input_node else None for input_node in node.inputs()]
+                node_info["inputs"] = tuple(input_node.path() if input_node else None for input_node in node.inputs())
             except Exception:
-                node_info["inputs"] = []
+                node_info["inputs"] = ()
 
             try:
-                node_info["outputs"] = [output_node.path() if output_node else None for output_node in node.outputs()]
+                node_info["outputs"] = tuple(output_node.path() if output_node else None for output_node in node.outputs())
             except Exception:
-                node_info["outputs"] = []
+                node_info["outputs"] = ()
             
-            # Add parameter info (limit to avoid overwhelming response)
-            for i, parm in enumerate(node.parms()):
+            # Add parameter info (limit to avoid overwhelming response).
+            # Walk tuples so a vector like 't' is one entry, not tx/ty/tz.
+            for i, parm_tuple in enumerate(parm_tuples):
                 if i >= 25:  # Limit to first 25 parameters
                     break
-                node_info["parameters"][parm.name()] = {
-                    "value": self._get_parameter_value(parm),
-                    "label": parm.description(),
-                    "type": parm.parmTemplate().type().name(),
+                template = parm_tuple.parmTemplate()
+                template_type = template.type()
+                if len(parm_tuple) > 1:
+                    value = tuple(self._get_parameter_value(parm, template_type) for parm in parm_tuple)
+                else:
+                    value = self._get_parameter_value(parm_tuple[0], template_type)
+                node_info["parameters"][parm_tuple.name()] = {
+                    "value": value,
+                    "label": template.label(),
+                    "type": template_type.name(),
                 }
             
             # Add more specific info for different node types
-            if node.type().category().name() == "Sop":  # Geometry nodes
+            if category == "Sop":  # Geometry nodes
                 geo = node.geometry()
                 if geo:
                     node_info["geometry"] = {
                         "point_count": geo.intrinsicValue("pointcount"),
                         "prim_count": geo.intrinsicValue("primitivecount"),
                         "vertex_count": geo.intrinsicValue("vertexcount"),
-                        "bounds": list(geo.boundingBox().sizes()),
+                        "bounds": tuple(geo.boundingBox().sizes()),
                     }
             
             return node_info
@@ -410,24 +1273,16 @@ class HoudiniMCPServer:
             traceback.print_exc()
             return {"error": str(e)}
     
-    def _get_parameter_value(self, parm):
+    def _get_parameter_value(self, parm, template_type=None):
         """Helper to get parameter value in a JSON-serializable format"""
         try:
-            parm_type = parm.parmTemplate().type()
-
-            if parm_type == hou.parmTemplateType.Float:
-                return parm.eval()
-            elif parm_type == hou.parmTemplateType.Int:
-                return parm.eval()
-            elif parm_type == hou.parmTemplateType.String:
-                return parm.eval()
-            elif parm_type == hou.parmTemplateType.Toggle:
-                return bool(parm.eval())
-            elif parm_type == hou.parmTemplateType.Menu:
-                return parm.eval()
-            else:
-                # For complex types, convert to string
-                return str(parm.eval())
+            if template_type is None:
+                template_type = parm.parmTemplate().type()
+            evaluate = self._PARM_EVALUATORS.get(template_type)
+            if evaluate is not None:
+                return evaluate(parm)
+            # For complex types, convert to string
+            return str(parm.eval())
         except Exception:
             return "error getting value"
     
@@ -438,7 +1293,7 @@ class HoudiniMCPServer:
                    position: Optional[List[float]] = None) -> Dict[str, Any]:
         """Create a new node in the network"""
         try:
-            parent = hou.node(parent_path)
+            parent = self._node(parent_path)
             if not parent:
                 raise ValueError(f"Parent node not found: {parent_path}")
             
@@ -450,19 +1305,21 @@ class HoudiniMCPServer:
                 new_node.setPosition((position[0], position[1]))
             
             # Special handling for specific node types
-            category = new_node.type().category().name()
+            ntype = new_node.type()
+            category = ntype.category().name()
             
             # For SOPs, set display flag
             if category == "Sop":
                 new_node.setDisplayFlag(True)
                 new_node.setRenderFlag(True)
             
+            pos = new_node.position()
             return {
                 "path": new_node.path(),
                 "name": new_node.name(),
-                "type": new_node.type().name(),
+                "type": ntype.name(),
                 "category": category,
-                "position": [new_node.position()[0], new_node.position()[1]]
+                "position": (pos[0], pos[1])
             }
         except Exception as e:
             print(f"Error in create_node: {str(e)}")
@@ -478,7 +1335,7 @@ class HoudiniMCPServer:
                    display: Optional[bool] = None) -> Dict[str, Any]:
         """Modify an existing node"""
         try:
-            node = hou.node(path)
+            node = self._node(path)
             if not node:
                 raise ValueError(f"Node not found: {path}")
             
@@ -491,6 +1348,7 @@ class HoudiniMCPServer:
                 
             if name:
                 node.setName(name)
+                self._node_cache.clear()  # Descendant paths changed too
                 
             if bypass is not None:
                 node.bypass(bypass)
@@ -500,11 +1358,12 @@ class HoudiniMCPServer:
                 if display:
                     node.setRenderFlag(True)
             
+            pos = node.position()
             return {
                 "path": node.path(),
                 "name": node.name(),
-                "position": [node.position()[0], node.position()[1]],
-                "color": list(node.color().rgb()),
+                "position": (pos[0], pos[1]),
+                "color": node.color().rgb(),
                 "is_bypassed": node.isBypassed(),
                 "is_displayed": node.isDisplayFlagSet()
             }
@@ -516,7 +1375,7 @@ class HoudiniMCPServer:
     def delete_node(self, path: str) -> Dict[str, Any]:
         """Delete a node from the network"""
         try:
-            node = hou.node(path)
+            node = self._node(path)
             if not node:
                 raise ValueError(f"Node not found: {path}")
             
@@ -525,6 +1384,7 @@ class HoudiniMCPServer:
             
             # Delete the node
             node.destroy()
+            self._node_cache.clear()  # Drop the node and any cached children
             
             return {
                 "deleted": True,
@@ -554,10 +1414,9 @@ class HoudiniMCPServer:
             if output:
                 response["output"] = output
             if result_value is not None:
-                try:
-                    json.dumps(result_value)  # test serializability
+                if _is_json_safe(result_value):
                     response["result"] = result_value
-                except (TypeError, ValueError):
+                else:
                     response["result"] = str(result_value)
             return response
         except Exception as e:
@@ -571,27 +1430,29 @@ class HoudiniMCPServer:
                       value: Any) -> Dict[str, Any]:
         """Set a parameter value on a node"""
         try:
-            node = hou.node(node_path)
+            node = self._node(node_path)
             if not node:
                 raise ValueError(f"Node not found: {node_path}")
             
-            parm = node.parm(parameter_name)
-            if not parm:
-                # Try to find in vector parms (e.g. 'tx' might be part of 't')
-                parm = node.parmTuple(parameter_name)
-                if not parm:
+            # A parm tuple covers both scalar parms and vectors such as 't';
+            # component names like 'tx' only resolve as individual parms
+            parm_tuple = node.parmTuple(parameter_name)
+            if parm_tuple is None:
+                parm = node.parm(parameter_name)
+                if parm is None:
                     raise ValueError(f"Parameter not found: {parameter_name}")
-            
-            # Set the parameter value
-            if isinstance(parm, hou.Parm):
-                parm.set(value)
-            elif isinstance(parm, hou.ParmTuple):
-                # For vector parms, ensure value is a list of correct length
-                if not isinstance(value, list):
-                    value = [value] * len(parm)
-                elif len(value) != len(parm):
-                    value = value[:len(parm)] + [value[-1]] * (len(parm) - len(value))
                 parm.set(value)
+            else:
+                size = len(parm_tuple)
+                if size == 1:
+                    parm_tuple[0].set(value)
+                else:
+                    # For vector parms, ensure value is a list of correct length
+                    if not isinstance(value, list):
+                        value = [value] * size
+                    elif len(value) != size:
+                        value = (value + [value[-1]] * size)[:size]
+                    parm_tuple.set(value)
             
             return {
                 "node": node_path,
@@ -611,12 +1472,12 @@ class HoudiniMCPServer:
                        parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Create a geometry node with the specified type"""
         try:
-            parent = hou.node(parent_path)
+            parent = self._node(parent_path)
             if not parent:
                 raise ValueError(f"Parent node not found: {parent_path}")
             
             # Create a geometry container if parent is not a SOP context
-            if parent.type().category().name() != "Sop":
+            if parent.type().category() != _SOP_CATEGORY:
                 # Find or create the geo node
                 geo_container = None
                 container_name = name + "_container" if name else "geo1"
@@ -634,22 +1495,8 @@ class HoudiniMCPServer:
                 # Set parent to the container
                 parent = geo_container
             
-            # Map common geo types to Houdini node types
-            geo_type_map = {
-                "box": "box",
-                "sphere": "sphere",
-                "torus": "torus",
-                "grid": "grid",
-                "tube": "tube",
-                "circle": "circle",
-                "curve": "curve",
-                "line": "line",
-                "platonic": "platonic",
-                "cylinder": "tube"  # Map cylinder to tube
-            }
-            
             # Default to box if type not recognized
-            houdini_type = geo_type_map.get(geo_type.lower(), "box")
+            houdini_type = _GEO_TYPE_MAP.get(geo_type.lower(), "box")
             
             # Create the geometry node
             geo_node = parent.createNode(houdini_type, name)
@@ -680,14 +1527,9 @@ class HoudiniMCPServer:
             geo_node.setDisplayFlag(True)
             geo_node.setRenderFlag(True)
             
-            return {
-                "path": geo_node.path(),
-                "name": geo_node.name(),
-                "type": geo_node.type().name(),
-                "category": geo_node.type().category().name(),
-                "position": [geo_node.position()[0], geo_node.position()[1]],
-                "parent": parent.path()
-            }
+            result = _node_summary(geo_node, category=True, position=True)
+            result["parent"] = parent.path()
+            return result
         except Exception as e:
             print(f"Error in create_geometry: {str(e)}")
             traceback.print_exc()
@@ -696,7 +1538,7 @@ class HoudiniMCPServer:
     def layout_network(self, path: str, auto_layout: bool = True) -> Dict[str, Any]:
         """Layout nodes in a network"""
         try:
-            network = hou.node(path)
+            network = self._node(path)
             if not network:
                 raise ValueError(f"Network not found: {path}")
             
@@ -721,11 +1563,11 @@ class HoudiniMCPServer:
                      to_input: int = 0) -> Dict[str, Any]:
         """Connect two nodes together"""
         try:
-            from_node = hou.node(from_path)
+            from_node = self._node(from_path)
             if not from_node:
                 raise ValueError(f"Source node not found: {from_path}")
                 
-            to_node = hou.node(to_path)
+            to_node = self._node(to_path)
             if not to_node:
                 raise ValueError(f"Destination node not found: {to_path}")
             
@@ -744,96 +1586,150 @@ class HoudiniMCPServer:
             traceback.print_exc()
             return {"error": str(e)}
     
+    @staticmethod
+    def _apply_parameters(node, parameters: Dict[str, Any], label: str):
+        """Set several parameters on node in one batch.
+
+        Scalar parms go through a single node.setParms() call and vector
+        parms are set per tuple, all inside one undo group. Parms that
+        already hold the value (and aren't animated) are left untouched so
+        they don't dirty the node. A value that fails is reported and
+        skipped without losing the others.
+        """
+        # One pass over the template group tells us which names are parm
+        # tuples and how wide they are, so names that don't exist are never
+        # looked up. Component names ("tx") and multiparm instances aren't
+        # in the group and still go through node.parm().
+        templates = _parm_templates_by_name(node.parmTemplateGroup())
+        scalar_updates = {}
+        tuple_updates = []
+        for param_name, param_value in parameters.items():
+            template = templates.get(param_name)
+            if template is None or template.numComponents() == 1:
+                parm = node.parm(param_name)
+                if parm is not None:
+                    if not _parm_holds(parm, param_value):
+                        scalar_updates[param_name] = param_value
+                    continue
+            # Try as vector parm
+            parm_tuple = node.parmTuple(param_name)
+            if parm_tuple is None:
+                continue
+            if not isinstance(param_value, list):
+                param_value = [param_value] * len(parm_tuple)
+            if not _parm_holds(parm_tuple, tuple(param_value)):
+                tuple_updates.append((param_name, parm_tuple, param_value))
+
+        if not scalar_updates and not tuple_updates:
+            return
+
+        with hou.undos.group(f"Set {label} parameters"):
+            if scalar_updates:
+                try:
+                    node.setParms(scalar_updates)
+                except Exception:
+                    # Find out which value was rejected, keeping the rest
+                    for param_name, param_value in scalar_updates.items():
+                        try:
+                            node.parm(param_name).set(param_value)
+                        except Exception as e:
+                            print(f"Error setting {label} parameter {param_name}: {str(e)}")
+            for param_name, parm_tuple, param_value in tuple_updates:
+                try:
+                    parm_tuple.set(param_value)
+                except Exception as e:
+                    print(f"Error setting {label} parameter {param_name}: {str(e)}")
+
+    @staticmethod
+    def _destroy_nodes(nodes):
+        """Destroy nodes (newest first) that a failed handler created."""
+        for node in reversed(nodes):
+            if node is None:
+                continue
+            try:
+                node.destroy()
+            except hou.ObjectWasDeleted:
+                pass
+            except Exception as e:
+                print(f"Error removing partially created node: {str(e)}")
+
     def set_material(self, 
                     node_path: str, 
                     material_type: str = "principledshader",
                     material_name: Optional[str] = None,
                     parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Create and apply a material to a node"""
+        created_nodes = []  # removed again if anything below fails
         try:
             # Get the target node
-            target_node = hou.node(node_path)
+            target_node = self._node(node_path)
             if not target_node:
                 raise ValueError(f"Node not found: {node_path}")
             
-            # Find or create a material network
-            mat_context = hou.node("/mat")
-            if not mat_context:
-                # Create the material context if it doesn't exist
-                mat_context = hou.node("/").createNode("mat")
-            
-            # Create the material
-            if not material_name:
-                material_name = f"{target_node.name()}_material"
-            
-            # Check if the material already exists
-            existing_mat = None
-            for node in mat_context.children():
-                if node.name() == material_name:
-                    existing_mat = node
-                    break
+            # Build everything as one undo step, without recooks in between
+            with _manual_update_mode(), hou.undos.group("HoudiniMCP: set material"):
+                # Find or create a material network
+                mat_context = self._node("/mat")
+                if not mat_context:
+                    # Create the material context if it doesn't exist
+                    mat_context = self._node("/").createNode("mat")
+                    created_nodes.append(mat_context)
+            
+                # Create the material
+                if not material_name:
+                    material_name = f"{target_node.name()}_material"
+            
+                # Check if the material already exists
+                existing_mat = mat_context.node(material_name)
+            
+                # Create or use existing material
+                if existing_mat:
+                    material = existing_mat
+                else:
+                    material = mat_context.createNode(material_type, material_name)
+                    created_nodes.append(material)
             
-            # Create or use existing material
-            if existing_mat:
-                material = existing_mat
-            else:
-                material = mat_context.createNode(material_type, material_name)
+                # Set material parameters if provided
+                if parameters:
+                    self._apply_parameters(material, parameters, "material")
             
-            # Set material parameters if provided
-            if parameters:
-                for param_name, param_value in parameters.items():
-                    try:
-                        parm = material.parm(param_name)
-                        if parm:
-                            parm.set(param_value)
-                        else:
-                            # Try as vector parm
-                            parm_tuple = material.parmTuple(param_name)
-                            if parm_tuple:
-                                if isinstance(param_value, list):
-                                    parm_tuple.set(param_value)
-                                else:
-                                    parm_tuple.set([param_value] * len(parm_tuple))
-                    except Exception as e:
-                        print(f"Error setting material parameter {param_name}: {str(e)}")
-            
-            # Apply the material to the target node
-            if target_node.type().category().name() == "Sop":
-                # For geometry nodes, set the shop_materialpath parameter
+                # Apply the material to the target node
                 material_path = material.path()
-                mat_parm = target_node.parm("shop_materialpath")
-                if mat_parm:
-                    mat_parm.set(material_path)
-                else:
-                    # If no material parameter, try to create a material SOP
-                    try:
-                        material_sop = target_node.createNode("material")
-                        material_sop.parm("shop_materialpath1").set(material_path)
+                if target_node.type().category() == _SOP_CATEGORY:
+                    # For geometry nodes, set the shop_materialpath parameter
+                    mat_parm = target_node.parm("shop_materialpath")
+                    if mat_parm:
+                        mat_parm.set(material_path)
+                    else:
+                        # If no material parameter, try to create a material SOP
+                        material_sop = None
+                        try:
+                            material_sop = target_node.createNode("material")
+                            material_sop.parm("shop_materialpath1").set(material_path)
                         
-                        # Connect to the end of the chain if possible
-                        displayed = None
-                        for node in target_node.children():
-                            if node.isDisplayFlagSet():
-                                displayed = node
-                                break
+                            # Connect to the end of the chain if possible
+                            displayed = target_node.displayNode()
                         
-                        if displayed:
-                            material_sop.setInput(0, displayed)
-                            material_sop.setDisplayFlag(True)
-                            material_sop.setRenderFlag(True)
-                            displayed.setDisplayFlag(False)
-                            displayed.setRenderFlag(False)
-                    except Exception as me:
-                        print(f"Error creating material SOP: {str(me)}")
+                            if displayed:
+                                material_sop.setInput(0, displayed)
+                                material_sop.setDisplayFlag(True)
+                                material_sop.setRenderFlag(True)
+                                displayed.setDisplayFlag(False)
+                                displayed.setRenderFlag(False)
+                        except Exception as me:
+                            print(f"Error creating material SOP: {str(me)}")
+                            # Don't leave a half-wired material SOP behind
+                            self._destroy_nodes([material_sop])
             
-            return {
-                "success": True,
-                "node": node_path,
-                "material": material.path(),
-                "material_name": material.name(),
-                "material_type": material.type().name()
-            }
+                return {
+                    "success": True,
+                    "node": node_path,
+                    "material": material_path,
+                    "material_name": material.name(),
+                    "material_type": material.type().name()
+                }
         except Exception as e:
+            self._destroy_nodes(created_nodes)
             print(f"Error in set_material: {str(e)}")
             traceback.print_exc()
             return {"error": str(e)}
@@ -845,7 +1741,7 @@ class HoudiniMCPServer:
                      node_type: str = "subnet") -> Dict[str, Any]:
         """Create a subnet node"""
         try:
-            parent = hou.node(parent_path)
+            parent = self._node(parent_path)
             if not parent:
                 raise ValueError(f"Parent node not found: {parent_path}")
             
@@ -856,13 +1752,7 @@ class HoudiniMCPServer:
             if position and len(position) == 2:
                 subnet.setPosition((position[0], position[1]))
             
-            return {
-                "path": subnet.path(),
-                "name": subnet.name(),
-                "type": subnet.type().name(),
-                "category": subnet.type().category().name(),
-                "position": [subnet.position()[0], subnet.position()[1]]
-            }
+            return _node_summary(subnet, category=True, position=True)
         except Exception as e:
             print(f"Error in create_subnet: {str(e)}")
             traceback.print_exc()
@@ -875,13 +1765,13 @@ class HoudiniMCPServer:
                            save_path: Optional[str] = None) -> Dict[str, Any]:
         """Create a digital asset from a node"""
         try:
-            node = hou.node(node_path)
+            node = self._node(node_path)
             if not node:
                 raise ValueError(f"Node not found: {node_path}")
             
             # Generate save path if not provided
             if not save_path:
-                temp_dir = hou.expandString("$TEMP")
+                temp_dir = self._get_temp_dir()
                 save_path = f"{temp_dir}/{name}.hda"
             
             # Set label if not provided
@@ -906,13 +1796,10 @@ class HoudiniMCPServer:
                 hda_def.setLabel(label)
                 hda_def.save()
             
-            return {
-                "success": True,
-                "path": hda_node.path(),
-                "name": hda_node.name(),
-                "type": hda_node.type().name(),
-                "hda_file": save_path
-            }
+            result = {"success": True}
+            result.update(_node_summary(hda_node))
+            result["hda_file"] = save_path
+            return result
         except Exception as e:
             print(f"Error in create_digital_asset: {str(e)}")
             traceback.print_exc()
@@ -921,7 +1808,7 @@ class HoudiniMCPServer:
     def get_parameter_info(self, node_path: str, parameter_name: Optional[str] = None) -> Dict[str, Any]:
         """Get detailed parameter information for a node"""
         try:
-            node = hou.node(node_path)
+            node = self._node(node_path)
             if not node:
                 raise ValueError(f"Node not found: {node_path}")
             
@@ -944,9 +1831,9 @@ class HoudiniMCPServer:
                         "name": parm_tuple.name(),
                         "label": parm_tuple.description(),
                         "type": parm_tuple.parmTemplate().type().name(),
-                        "value": [self._get_parameter_value(p) for p in parm_tuple],
+                        "value": tuple(self._get_parameter_value(p) for p in parm_tuple),
                         "is_vector": True,
-                        "components": [p.name() for p in parm_tuple]
+                        "components": tuple(p.name() for p in parm_tuple)
                     }
                 
                 raise ValueError(f"Parameter not found: {parameter_name}")
@@ -957,13 +1844,23 @@ class HoudiniMCPServer:
                 "parameters": {}
             }
             
-            # Include all parameters
-            for parm in node.parms():
-                result["parameters"][parm.name()] = {
-                    "label": parm.description(),
-                    "type": parm.parmTemplate().type().name(),
-                    "value": self._get_parameter_value(parm)
-                }
+            # Include all parameters. Templates come from one walk of the
+            # node's parm template group instead of a lookup per parm.
+            templates = _parm_templates_by_name(node.parmTemplateGroup())
+            for parm_tuple in node.parmTuples():
+                template = templates.get(parm_tuple.name())
+                if template is None:
+                    # e.g. multiparm instances, whose templates are named "foo#"
+                    template = parm_tuple.parmTemplate()
+                template_type = template.type()
+                label = template.label()
+                type_name = template_type.name()
+                for parm in parm_tuple:
+                    result["parameters"][parm.name()] = {
+                        "label": label,
+                        "type": type_name,
+                        "value": self._get_parameter_value(parm, template_type)
+                    }
             
             return result
         except Exception as e:
@@ -980,7 +1877,7 @@ class HoudiniMCPServer:
                 
                 # If it's untitled, save to temp
                 if not file_path or file_path == "untitled.hip":
-                    temp_dir = hou.expandString("$TEMP")
+                    temp_dir = self._get_temp_dir()
                     file_path = f"{temp_dir}/houdinimcp_save.hip"
             
             # Ensure the path has a .hip extension
@@ -1003,10 +1900,12 @@ class HoudiniMCPServer:
     def load_hip(self, file_path: str) -> Dict[str, Any]:
         """Load a Houdini scene file"""
         try:
-            # Check if the current scene has unsaved changes
+            # Check if the current scene has unsaved changes. Houdini's own
+            # flag is the only reliable signal: edits made with undo
+            # disabled or from job threads leave no other trace.
             if hou.hipFile.hasUnsavedChanges():
                 # Save to a temporary file
-                temp_dir = hou.expandString("$TEMP")
+                temp_dir = self._get_temp_dir()
                 backup_path = f"{temp_dir}/houdinimcp_backup.hip"
                 hou.hipFile.save(backup_path)
             
@@ -1030,7 +1929,7 @@ class HoudiniMCPServer:
                      look_at: Optional[List[float]] = None) -> Dict[str, Any]:
         """Create a camera with optional positioning"""
         try:
-            parent = hou.node(parent_path)
+            parent = self._node(parent_path)
             if not parent:
                 raise ValueError(f"Parent node not found: {parent_path}")
             
@@ -1048,18 +1947,10 @@ class HoudiniMCPServer:
                     from_pos = hou.Vector3(camera.evalParmTuple("t"))
                     to_pos = hou.Vector3(look_at)
                     
-                    # Create a rotation that points to the target
-                    direction = to_pos - from_pos
-                    rotation = hou.Vector3(0, 0, 0)
-                    
-                    # Calculate rotations
-                    # X-axis rotation (pitch)
-                    rotation[0] = -math.atan2(direction[1], math.sqrt(direction[0]**2 + direction[2]**2))
-                    # Y-axis rotation (yaw)
-                    rotation[1] = math.atan2(direction[0], direction[2])
-                    
-                    # Convert to degrees
-                    rotation = hou.Vector3([math.degrees(angle) for angle in rotation])
+                    # Let HOM build the look-at rotation (camera -Z toward
+                    # the target, Y up) and hand back Euler angles in degrees
+                    look_at_matrix = hou.hmath.buildRotateLookAt(from_pos, to_pos, hou.Vector3(0, 1, 0))
+                    rotation = look_at_matrix.extractRotates()
                     
                     # Set rotation parameters
                     camera.parmTuple("r").set(rotation)
@@ -1069,13 +1960,10 @@ class HoudiniMCPServer:
                     if look_at_parm:
                         look_at_parm.set(look_at)
             
-            return {
-                "path": camera.path(),
-                "name": camera.name(),
-                "type": camera.type().name(),
-                "position": list(camera.evalParmTuple("t")),
-                "rotation": list(camera.evalParmTuple("r"))
-            }
+            result = _node_summary(camera)
+            result["position"] = camera.evalParmTuple("t")
+            result["rotation"] = camera.evalParmTuple("r")
+            return result
         except Exception as e:
             print(f"Error in create_camera: {str(e)}")
             traceback.print_exc()
@@ -1089,21 +1977,12 @@ class HoudiniMCPServer:
                     parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Create a light of the specified type"""
         try:
-            parent = hou.node(parent_path)
+            parent = self._node(parent_path)
             if not parent:
                 raise ValueError(f"Parent node not found: {parent_path}")
             
-            # Map light types to Houdini node types
-            light_type_map = {
-                "point": "hlight", 
-                "spot": "hlight",
-                "directional": "hlight",
-                "area": "hlight",
-                "environment": "envlight"
-            }
-            
             # Default to hlight if type not recognized
-            houdini_type = light_type_map.get(light_type.lower(), light_type.lower())
+            houdini_type = _LIGHT_TYPE_MAP.get(light_type.lower(), light_type.lower())
             
             # Create the light
             light = parent.createNode(houdini_type, name)
@@ -1113,42 +1992,19 @@ class HoudiniMCPServer:
                 light.parmTuple("t").set(position)
             
             # Set light type for hlights
-            if houdini_type == "hlight" and light_type.lower() in ["point", "spot", "directional", "area"]:
+            if houdini_type == "hlight" and light_type.lower() in _LIGHT_TYPE_VALUES:
                 light_type_parm = light.parm("light_type")
                 if light_type_parm:
-                    light_type_map_values = {
-                        "point": 0,
-                        "spot": 1,
-                        "directional": 2,
-                        "area": 3
-                    }
-                    light_type_parm.set(light_type_map_values.get(light_type.lower(), 0))
+                    light_type_parm.set(_LIGHT_TYPE_VALUES[light_type.lower()])
             
             # Set parameters if provided
             if parameters:
-                for param_name, param_value in parameters.items():
-                    try:
-                        parm = light.parm(param_name)
-                        if parm:
-                            parm.set(param_value)
-                        else:
-                            # Try as vector parm
-                            parm_tuple = light.parmTuple(param_name)
-                            if parm_tuple:
-                                if isinstance(param_value, list):
-                                    parm_tuple.set(param_value)
-                                else:
-                                    parm_tuple.set([param_value] * len(parm_tuple))
-                    except Exception as e:
-                        print(f"Error setting light parameter {param_name}: {str(e)}")
+                self._apply_parameters(light, parameters, "light")
             
-            return {
-                "path": light.path(),
-                "name": light.name(),
-                "type": light.type().name(),
-                "light_type": light_type.lower(),
-                "position": list(light.evalParmTuple("t"))
-            }
+            result = _node_summary(light)
+            result["light_type"] = light_type.lower()
+            result["position"] = light.evalParmTuple("t")
+            return result
         except Exception as e:
             print(f"Error in create_light: {str(e)}")
             traceback.print_exc()
@@ -1160,108 +2016,95 @@ class HoudiniMCPServer:
                   name: Optional[str] = None,
                   position: Optional[List[float]] = None) -> Dict[str, Any]:
         """Create a simulation network of the specified type"""
+        created_nodes = []  # removed again if anything below fails
         try:
-            parent = hou.node(parent_path)
+            parent = self._node(parent_path)
             if not parent:
                 raise ValueError(f"Parent node not found: {parent_path}")
             
-            # Map simulation types to Houdini node types
-            sim_type_map = {
-                "pyro": "dopnet",
-                "fluid": "dopnet",
-                "cloth": "dopnet",
-                "rigid": "dopnet",
-                "wire": "dopnet",
-                "grains": "dopnet",
-                "flip": "dopnet",
-                "popnet": "popnet",
-                "particles": "popnet",
-                "crowd": "crowdsim"
-            }
-            
             # Default to dopnet if type not recognized
-            houdini_type = sim_type_map.get(sim_type.lower(), "dopnet")
+            houdini_type = _SIM_TYPE_MAP.get(sim_type.lower(), "dopnet")
             
-            # Create the simulation network
-            if not name:
-                name = f"{sim_type.lower()}_sim"
+            # Build everything as one undo step, without recooks in between
+            with _manual_update_mode(), hou.undos.group("HoudiniMCP: create simulation"):
+                # Create the simulation network
+                if not name:
+                    name = f"{sim_type.lower()}_sim"
             
-            sim_node = parent.createNode(houdini_type, name)
+                sim_node = parent.createNode(houdini_type, name)
+                created_nodes.append(sim_node)
             
-            # Set position if provided
-            if position and len(position) == 2:
-                sim_node.setPosition((position[0], position[1]))
+                # Set position if provided
+                if position and len(position) == 2:
+                    sim_node.setPosition((position[0], position[1]))
             
-            # Special setup for different sim types
-            if sim_type.lower() == "pyro":
-                # Try to set up a pyro simulation
-                try:
-                    # Execute the shelf tool or create basic setup
-                    shelf_tool = hou.shelves.tools().get("shelf_pyro_setupsim")
-                    if shelf_tool:
-                        shelf_tool.execute()
-                    else:
-                        # Basic setup - create source
-                        geo = parent.createNode("geo", f"{name}_source")
-                        geo.setPosition((sim_node.position()[0] - 3, sim_node.position()[1]))
-                        
-                        # Create a sphere as emission source
-                        sphere = geo.createNode("sphere")
-                        sphere.setDisplayFlag(True)
-                        sphere.setRenderFlag(True)
-                except Exception as setup_error:
-                    print(f"Error setting up pyro sim: {str(setup_error)}")
-            
-            elif sim_type.lower() == "flip":
-                # Try to set up a FLIP simulation
-                try:
-                    shelf_tool = hou.shelves.tools().get("shelf_fluids_setupsim")
-                    if shelf_tool:
-                        shelf_tool.execute()
-                    else:
-                        # Basic setup
-                        geo = parent.createNode("geo", f"{name}_source")
-                        geo.setPosition((sim_node.position()[0] - 3, sim_node.position()[1]))
-                        
-                        # Create a container
-                        box = geo.createNode("box")
-                        box.setDisplayFlag(True)
-                        box.setRenderFlag(True)
-                except Exception as setup_error:
-                    print(f"Error setting up FLIP sim: {str(setup_error)}")
-            
-            elif sim_type.lower() == "particles" or houdini_type == "popnet":
-                # Try to set up a particle simulation
-                try:
-                    if sim_node.type().name() == "popnet":
-                        # Basic POP setup
-                        source = sim_node.createNode("popnet_source")
-                        source.setPosition((0, 0))
+                # Special setup for different sim types
+                if sim_type.lower() == "pyro":
+                    # Try to set up a pyro simulation
+                    try:
+                        # Execute the shelf tool or create basic setup
+                        shelf_tool = _shelf_tool("shelf_pyro_setupsim")
+                        if shelf_tool:
+                            shelf_tool.execute()
+                        else:
+                            # Basic setup - a sphere as emission source
+                            created_nodes.append(self._make_sim_source(parent, sim_node, name, "sphere"))
+                    except Exception as setup_error:
+                        print(f"Error setting up pyro sim: {str(setup_error)}")
+            
+                elif sim_type.lower() == "flip":
+                    # Try to set up a FLIP simulation
+                    try:
+                        shelf_tool = _shelf_tool("shelf_fluids_setupsim")
+                        if shelf_tool:
+                            shelf_tool.execute()
+                        else:
+                            # Basic setup - a box as the container
+                            created_nodes.append(self._make_sim_source(parent, sim_node, name, "box"))
+                    except Exception as setup_error:
+                        print(f"Error setting up FLIP sim: {str(setup_error)}")
+            
+                elif sim_type.lower() == "particles" or houdini_type == "popnet":
+                    # Try to set up a particle simulation
+                    try:
+                        if sim_node.type().name() == "popnet":
+                            # Basic POP setup
+                            source = sim_node.createNode("popnet_source")
+                            source.setPosition((0, 0))
                         
-                        location = sim_node.createNode("popnet_location")
-                        location.setPosition((0, -2))
+                            location = sim_node.createNode("popnet_location")
+                            location.setPosition((0, -2))
                         
-                        # Connect them
-                        location.setInput(0, source)
+                            # Connect them
+                            location.setInput(0, source)
                         
-                        # Set defaults
-                        location.setDisplayFlag(True)
-                        location.setRenderFlag(True)
-                except Exception as setup_error:
-                    print(f"Error setting up particle sim: {str(setup_error)}")
-            
-            return {
-                "path": sim_node.path(),
-                "name": sim_node.name(),
-                "type": sim_node.type().name(),
-                "sim_type": sim_type.lower(),
-                "position": [sim_node.position()[0], sim_node.position()[1]]
-            }
+                            # Set defaults
+                            location.setDisplayFlag(True)
+                            location.setRenderFlag(True)
+                    except Exception as setup_error:
+                        print(f"Error setting up particle sim: {str(setup_error)}")
+            
+                result = _node_summary(sim_node, position=True)
+                result["sim_type"] = sim_type.lower()
+                return result
         except Exception as e:
+            self._destroy_nodes(created_nodes)
             print(f"Error in create_sim: {str(e)}")
             traceback.print_exc()
             return {"error": str(e)}
     
+    @staticmethod
+    def _make_sim_source(parent, sim_node, name: str, prim_type: str):
+        """Create a <name>_source geo beside sim_node holding a prim_type SOP."""
+        sim_pos = sim_node.position()
+        geo = parent.createNode("geo", f"{name}_source")
+        geo.setPosition((sim_pos[0] - 3, sim_pos[1]))
+
+        prim = geo.createNode(prim_type)
+        prim.setDisplayFlag(True)
+        prim.setRenderFlag(True)
+        return geo
+
     def run_simulation(self, 
                       node_path: str,
                       start_frame: int = 1,
@@ -1269,19 +2112,19 @@ class HoudiniMCPServer:
                       save_to_disk: bool = False) -> Dict[str, Any]:
         """Run a simulation for the specified node"""
         try:
-            node = hou.node(node_path)
+            node = self._node(node_path)
             if not node:
                 raise ValueError(f"Node not found: {node_path}")
             
             # Check node type
             node_type = node.type().name().lower()
-            if not any(sim_type in node_type for sim_type in ["dop", "pop", "crowd", "sim"]):
+            if node_type not in _SIM_NETWORK_TYPES and not node_type.endswith("sim"):
                 raise ValueError(f"Node is not a simulation network: {node_path}")
             
             # Set up temporary directory for caches if saving to disk
             cache_path = None
             if save_to_disk:
-                temp_dir = hou.expandString("$TEMP")
+                temp_dir = self._get_temp_dir()
                 cache_path = f"{temp_dir}/{node.name()}_cache"
                 
                 # Try to set cache parameter if it exists
@@ -1289,26 +2132,32 @@ class HoudiniMCPServer:
                 if cache_parm:
                     cache_parm.set(cache_path)
             
-            # Store original frame range
-            original_start = hou.playbar.frameRange()[0]
-            original_end = hou.playbar.frameRange()[1]
-            
-            # Set simulation range
-            hou.playbar.setFrameRange(start_frame, end_frame)
-            
-            # Run the simulation
-            if node_type == "dopnet":
-                node.parm("execute").pressButton()
-            elif node_type == "popnet":
-                node.parm("execute").pressButton()
-            else:
-                # Generic approach - try to cook the node for each frame
-                for frame in range(start_frame, end_frame + 1):
-                    hou.setFrame(frame)
-                    node.cook(force=True)
+            # Store original frame range; each playbar change emits events,
+            # so leave it alone when it already matches
+            original_range = hou.playbar.frameRange()
+            change_range = tuple(original_range) != (start_frame, end_frame)
             
-            # Restore original frame range
-            hou.playbar.setFrameRange(original_start, original_end)
+            # No viewport redraws while the frames cook
+            with _manual_update_mode():
+                # Set simulation range
+                if change_range:
+                    hou.playbar.setFrameRange(start_frame, end_frame)
+                try:
+                    # Run the simulation
+                    if node_type in _EXECUTABLE_SIM_TYPES:
+                        node.parm("execute").pressButton()
+                    else:
+                        # Generic approach - let Houdini cook the whole range
+                        # natively rather than stepping frames from Python
+                        _, errors = hou.hscript(
+                            f'opcook -F -f {start_frame} {end_frame} 1 "{node.path()}"'
+                        )
+                        if errors:
+                            raise RuntimeError(errors.strip())
+                finally:
+                    # Restore original frame range
+                    if change_range:
+                        hou.playbar.setFrameRange(*original_range)
             
             return {
                 "success": True,
@@ -1323,53 +2172,159 @@ class HoudiniMCPServer:
             traceback.print_exc()
             return {"error": str(e)}
     
+    def _get_rop(self, rop_type: str, name: Optional[str] = None):
+        """Return a reusable ROP of rop_type, creating it on first use.
+
+        Export ROPs (and render_cop's Composite ROP) live in a hidden
+        /out/houdinimcp_cache subnet and are reconfigured per call instead
+        of being created and destroyed. name (default: rop_type) tells apart
+        several ROPs of one type, like render_scene_multi's per-camera ROPs.
+        """
+        name = name or rop_type
+        rop = self._rop_cache.get(name)
+        if rop is not None:
+            try:
+                rop.path()
+                return rop
+            except hou.ObjectWasDeleted:
+                pass
+
+        out = self._get_out_context()
+        cache_net = out.node("houdinimcp_cache")
+        if cache_net is None:
+            cache_net = out.createNode("subnet", "houdinimcp_cache")
+            try:
+                cache_net.hide(True)
+            except Exception:
+                pass
+        rop = cache_net.node(name) or cache_net.createNode(rop_type, name)
+        self._rop_cache[name] = rop
+        return rop
+
+    def _resolve_export_path(self, file_path: Optional[str], node, exts: Tuple[str, ...]) -> str:
+        """Return file_path with one of exts, or a $TEMP path named after node.
+
+        exts[0] is the extension appended to other paths and used in $TEMP.
+        """
+        if not file_path:
+            return f"{self._get_temp_dir()}/{node.name()}{exts[0]}"
+        return file_path if file_path.endswith(exts) else file_path + exts[0]
+
+    def _run_export(self,
+                    rop_type: str,
+                    settings: Dict[str, Any],
+                    animation: bool,
+                    background: bool) -> Optional[str]:
+        """Configure the cached ROP of rop_type and run it.
+
+        settings maps ROP parm names to values. With background set, the
+        ROP is run by a separate hython process and the new job id is
+        returned; otherwise it runs here and None is returned.
+        """
+        settings = dict(settings)
+        if animation:
+            frame_range = hou.playbar.frameRange()
+            settings.update(trange=1, f1=frame_range[0], f2=frame_range[1])  # Render frame range
+        else:
+            settings["trange"] = 0  # Render current frame
+
+        rop = self._get_rop(rop_type)
+        rop.setParms(settings)
+        if background:
+            return self._spawn_job({"rop": rop.path()})
+        rop.parm("execute").pressButton()
+        return None
+
+    def _spawn_job(self, spec: Dict[str, Any]) -> str:
+        """Run a job spec for _JOB_SCRIPT in hython and return its id for get_job_status.
+
+        The process loads a backup copy of the session as it is now, so the
+        ROPs it renders must already be configured. The session itself, its
+        file name and its unsaved-changes flag are left alone.
+        """
+        temp_dir = self._get_temp_dir()
+        if self._job_script_path is None:
+            self._job_script_path = os.path.join(temp_dir, "houdinimcp_job.py")
+            with open(self._job_script_path, "w") as f:
+                f.write(_JOB_SCRIPT)
+        hip_copy = hou.hipFile.saveAsBackup()
+        job_id = uuid.uuid4().hex[:12]
+        log_path = os.path.join(temp_dir, f"houdinimcp_job_{job_id}.log")
+        hython = os.path.join(hou.expandString("$HFS"), "bin",
+                              "hython.exe" if sys.platform == "win32" else "hython")
+        try:
+            with open(log_path, "wb") as log:
+                process = subprocess.Popen(
+                    [hython, self._job_script_path, hip_copy, json.dumps(spec)],
+                    stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                    creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0))
+        except Exception:
+            os.remove(hip_copy)
+            raise
+        self._jobs[job_id] = (process, log_path)
+        return job_id
+
+    @staticmethod
+    def _finished_job(process, log_path: str) -> Dict[str, Any]:
+        """Read the outcome of a finished hython job from its log, then remove the log."""
+        try:
+            with open(log_path, "r", errors="replace") as f:
+                lines = [line.strip() for line in f if line.strip()]
+        finally:
+            try:
+                os.remove(log_path)
+            except OSError:
+                pass
+        results = [line for line in lines if line.startswith(_JOB_RESULT_MARKER)]
+        if process.returncode != 0 or not results:
+            message = lines[-1] if lines else f"hython exited with code {process.returncode}"
+            return {"status": "error", "message": message}
+        reply = {"status": "done"}
+        method = json.loads(results[-1][len(_JOB_RESULT_MARKER):])
+        if method is not None:
+            reply["result"] = method
+        return reply
+
+    def get_job_status(self, job_id: str) -> Dict[str, Any]:
+        """Report the state of a background export or render"""
+        try:
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise ValueError(f"Unknown job: {job_id}")
+            process, log_path = job
+            if process.poll() is None:
+                return {"job_id": job_id, "status": "running"}
+
+            # Finished jobs are reported once, then forgotten
+            del self._jobs[job_id]
+            return {"job_id": job_id, **self._finished_job(process, log_path)}
+        except Exception as e:
+            print(f"Error in get_job_status: {str(e)}")
+            traceback.print_exc()
+            return {"error": str(e)}
+
     def export_fbx(self,
                   node_path: str,
                   file_path: Optional[str] = None,
-                  animation: bool = False) -> Dict[str, Any]:
+                  animation: bool = False,
+                  background: bool = False) -> Dict[str, Any]:
         """Export a node to FBX format using a filmboxfbx ROP"""
         try:
-            node = hou.node(node_path)
+            node = self._node(node_path)
             if not node:
                 raise ValueError(f"Node not found: {node_path}")
 
-            # Generate file path if not provided
-            if not file_path:
-                temp_dir = hou.expandString("$TEMP")
-                file_path = f"{temp_dir}/{node.name()}.fbx"
-
-            # Ensure the path has an fbx extension
-            if not file_path.endswith(".fbx"):
-                file_path += ".fbx"
-
-            # Create a temporary filmboxfbx ROP (same pattern as export_abc/export_usd)
-            rop = hou.node("/out") or hou.node("/").createNode("out")
-            fbx_rop = rop.createNode("filmboxfbx")
-
-            # Configure the ROP
-            fbx_rop.parm("sopoutput").set(file_path)
-            fbx_rop.parm("startnode").set(node_path)
-
-            if animation:
-                frame_range = hou.playbar.frameRange()
-                fbx_rop.parm("trange").set(1)
-                fbx_rop.parm("f1").set(frame_range[0])
-                fbx_rop.parm("f2").set(frame_range[1])
-            else:
-                fbx_rop.parm("trange").set(0)
-
-            # Execute the ROP
-            fbx_rop.parm("execute").pressButton()
+            file_path = self._resolve_export_path(file_path, node, (".fbx",))
 
-            # Clean up
-            fbx_rop.destroy()
+            # Reuse the cached filmboxfbx ROP (same pattern as export_abc/export_usd)
+            job_id = self._run_export(
+                "filmboxfbx",
+                {"sopoutput": file_path, "startnode": node_path},
+                animation,
+                background,
+            )
 
-            return {
-                "success": True,
-                "node": node_path,
-                "file_path": file_path,
-                "animation": animation
-            }
+            return self._export_result(node_path, file_path, animation, job_id)
         except Exception as e:
             print(f"Error in export_fbx: {str(e)}")
             traceback.print_exc()
@@ -1378,52 +2333,25 @@ class HoudiniMCPServer:
     def export_abc(self, 
                   node_path: str,
                   file_path: Optional[str] = None,
-                  animation: bool = False) -> Dict[str, Any]:
+                  animation: bool = False,
+                  background: bool = False) -> Dict[str, Any]:
         """Export a node to Alembic format"""
         try:
-            node = hou.node(node_path)
+            node = self._node(node_path)
             if not node:
                 raise ValueError(f"Node not found: {node_path}")
             
-            # Generate file path if not provided
-            if not file_path:
-                temp_dir = hou.expandString("$TEMP")
-                file_path = f"{temp_dir}/{node.name()}.abc"
-            
-            # Ensure the path has an abc extension
-            if not file_path.endswith(".abc"):
-                file_path += ".abc"
+            file_path = self._resolve_export_path(file_path, node, (".abc",))
             
             # Export the node - we need to use ROP Alembic Output
-            rop = hou.node("/out") or hou.node("/").createNode("out")
-            alembic_rop = rop.createNode("alembic")
-            
-            # Configure the ROP
-            alembic_rop.parm("filename").set(file_path)
-            alembic_rop.parm("root").set(node_path)
-            
-            if animation:
-                # Export with animation
-                frame_range = hou.playbar.frameRange()
-                alembic_rop.parm("trange").set(1)  # Set to render frame range
-                alembic_rop.parm("f1").set(frame_range[0])
-                alembic_rop.parm("f2").set(frame_range[1])
-            else:
-                # Export single frame
-                alembic_rop.parm("trange").set(0)  # Set to render current frame
-            
-            # Execute the ROP
-            alembic_rop.parm("execute").pressButton()
-            
-            # Clean up - delete the temporary ROP
-            alembic_rop.destroy()
+            job_id = self._run_export(
+                "alembic",
+                {"filename": file_path, "root": node_path},
+                animation,
+                background,
+            )
             
-            return {
-                "success": True,
-                "node": node_path,
-                "file_path": file_path,
-                "animation": animation
-            }
+            return self._export_result(node_path, file_path, animation, job_id)
         except Exception as e:
             print(f"Error in export_abc: {str(e)}")
             traceback.print_exc()
@@ -1432,137 +2360,207 @@ class HoudiniMCPServer:
     def export_usd(self, 
                   node_path: str,
                   file_path: Optional[str] = None,
-                  animation: bool = False) -> Dict[str, Any]:
+                  animation: bool = False,
+                  background: bool = False) -> Dict[str, Any]:
         """Export a node to USD format"""
         try:
-            node = hou.node(node_path)
+            node = self._node(node_path)
             if not node:
                 raise ValueError(f"Node not found: {node_path}")
             
-            # Generate file path if not provided
-            if not file_path:
-                temp_dir = hou.expandString("$TEMP")
-                file_path = f"{temp_dir}/{node.name()}.usd"
-            
-            # Ensure the path has a usd extension
-            if not file_path.endswith((".usd", ".usda", ".usdc")):
-                file_path += ".usd"
+            file_path = self._resolve_export_path(file_path, node, (".usd", ".usda", ".usdc"))
             
             # Export the node - we need to use ROP USD Output
-            rop = hou.node("/out") or hou.node("/").createNode("out")
-            usd_rop = rop.createNode("usd")
-            
-            # Configure the ROP
-            usd_rop.parm("lopoutput").set(file_path)
-            usd_rop.parm("target").set(node_path)
-            
-            if animation:
-                # Export with animation
-                frame_range = hou.playbar.frameRange()
-                usd_rop.parm("trange").set(1)  # Set to render frame range
-                usd_rop.parm("f1").set(frame_range[0])
-                usd_rop.parm("f2").set(frame_range[1])
-            else:
-                # Export single frame
-                usd_rop.parm("trange").set(0)  # Set to render current frame
-            
-            # Execute the ROP
-            usd_rop.parm("execute").pressButton()
-            
-            # Clean up - delete the temporary ROP
-            usd_rop.destroy()
+            job_id = self._run_export(
+                "usd",
+                {"lopoutput": file_path, "target": node_path},
+                animation,
+                background,
+            )
             
-            return {
-                "success": True,
-                "node": node_path,
-                "file_path": file_path,
-                "animation": animation
-            }
+            return self._export_result(node_path, file_path, animation, job_id)
         except Exception as e:
             print(f"Error in export_usd: {str(e)}")
             traceback.print_exc()
             return {"error": str(e)}
+
+    @staticmethod
+    def _export_result(node_path: str, file_path: str, animation: bool, job_id: Optional[str]) -> Dict[str, Any]:
+        """Build the reply shared by the export handlers."""
+        result = {
+            "success": True,
+            "node": node_path,
+            "file_path": file_path,
+            "animation": animation
+        }
+        if job_id is not None:
+            result["job_id"] = job_id
+            result["status"] = "running"
+        return result
     
     def render_scene(self, 
                     output_path: Optional[str] = None,
                     renderer: str = "mantra",
                     resolution: Optional[List[int]] = None,
-                    camera_path: Optional[str] = None) -> Dict[str, Any]:
-        """Render the current scene using the specified renderer"""
+                    camera_path: Optional[str] = None,
+                    background: bool = False) -> Dict[str, Any]:
+        """Render the current scene using the specified renderer
+
+        With background set, a separate hython process renders a copy of
+        the scene and the reply carries a job id for get_job_status.
+        """
         try:
             # Generate output path if not provided
             if not output_path:
-                temp_dir = hou.expandString("$TEMP")
+                temp_dir = self._get_temp_dir()
                 output_path = f"{temp_dir}/houdinimcp_render.exr"
             
             # Ensure path has an extension
-            if not any(output_path.endswith(ext) for ext in [".exr", ".jpg", ".png", ".tif", ".tiff"]):
+            if not output_path.endswith(_RENDER_EXTS):
                 output_path += ".exr"
             
-            # Create or find the ROP
-            out_context = hou.node("/out")
-            if not out_context:
-                out_context = hou.node("/").createNode("out")
-            
             # Create the appropriate ROP based on renderer
-            renderer_map = {
-                "mantra": "ifd",
-                "karma": "karma",
-                "arnold": "arnold",
-                "redshift": "redshift_rop",
-                "renderman": "renderman_rop"
-            }
+            rop_type = _RENDERER_ROP_TYPES.get(renderer.lower(), "ifd")
             
-            rop_type = renderer_map.get(renderer.lower(), "ifd")
+            # Create or find the ROP
+            out_context = self._get_out_context()
             
-            # Try to find an existing ROP of the right type
+            # Reuse the ROP found last time if it's still there and still of
+            # that type; otherwise ask the node type for its instances in /out
             existing_rop = None
-            for node in out_context.children():
-                if node.type().name() == rop_type:
-                    existing_rop = node
-                    break
+            cached_path = self._render_rop_paths.get(rop_type)
+            if cached_path:
+                existing_rop = self._node(cached_path)
+                if existing_rop is not None and existing_rop.type().name() != rop_type:
+                    existing_rop = None
+            if existing_rop is None:
+                node_type = hou.nodeType(hou.ropNodeTypeCategory(), rop_type)
+                if node_type is not None:
+                    existing_rop = next(
+                        (node for node in node_type.instances() if node.parent() == out_context),
+                        None,
+                    )
             
             if existing_rop:
                 rop = existing_rop
             else:
                 # Create a new ROP
                 rop = out_context.createNode(rop_type)
+            self._render_rop_paths[rop_type] = rop.path()
+            
+            with _batch_scene_edit():
+                self._configure_render_rop(rop, rop_type, output_path, camera_path, resolution)
             
-            # Configure the ROP
+            result = {
+                "success": True,
+                "file_path": output_path,
+                "renderer": renderer
+            }
+            if background:
+                result["job_id"] = self._spawn_job({"rop": rop.path()})
+                result["status"] = "running"
+            else:
+                rop.parm("execute").pressButton()
+            if resolution:
+                result["resolution"] = resolution
+            else:
+                # Read both components in one call; ROPs without Mantra's
+                # res_override tuple just leave the resolution out
+                res_tuple = rop.parmTuple("res_override")
+                if res_tuple is not None:
+                    result["resolution"] = list(res_tuple.eval())
+            return result
+        except Exception as e:
+            _log.exception("Error in render_scene: %s", e)
+            return {"error": str(e)}
+
+    def _configure_render_rop(self,
+                              rop,
+                              rop_type: str,
+                              output_path: str,
+                              camera_path: Optional[str],
+                              resolution: Optional[List[int]]):
+        """Point a render ROP at output_path for the current frame in one setParms() call."""
+        settings = {
             # Set output path
-            if rop_type == "ifd":
-                rop.parm("vm_picture").set(output_path)
-            elif rop_type in ["karma", "arnold", "redshift_rop", "renderman_rop"]:
-                rop.parm("output").set(output_path)
-            
-            # Set camera if provided
-            if camera_path:
-                camera = hou.node(camera_path)
-                if camera:
-                    rop.parm("camera").set(camera_path)
-            
-            # Set resolution if provided
-            if resolution and len(resolution) == 2:
-                rop.parm("res_override").set(1)  # Enable resolution override
-                rop.parm("res_fraction").set("specific")
-                rop.parm("res_overridex").set(resolution[0])
-                rop.parm("res_overridey").set(resolution[1])
-            
-            # Set to render only one frame
-            rop.parm("trange").set(0)  # Set to render current frame
-            
-            # Execute the ROP
-            rop.parm("execute").pressButton()
+            "vm_picture" if rop_type == "ifd" else "output": output_path,
+            "trange": 0,  # Set to render current frame
+        }
+        
+        # Set camera if provided
+        if camera_path and self._node(camera_path):
+            settings["camera"] = camera_path
+        
+        # Set resolution if provided
+        if resolution and len(resolution) == 2:
+            settings.update(
+                override_camerares=1,  # Enable resolution override
+                res_fraction="specific",
+                res_overridex=resolution[0],
+                res_overridey=resolution[1],
+            )
+        
+        # setParms() rejects the whole batch over one unknown name, and
+        # not every renderer's ROP has all of these
+        rop.setParms({name: value for name, value in settings.items() if rop.parm(name) is not None})
+
+    def render_scene_multi(self,
+                           cameras: List[str],
+                           output_template: Optional[str] = None,
+                           renderer: str = "mantra",
+                           resolution: Optional[List[int]] = None) -> Dict[str, Any]:
+        """Render the current frame from several cameras in one call.
+
+        Each camera gets its own cached render ROP, all wired into one merge
+        ROP, which renders the views one after another; each is a full
+        render of its own. output_template may use {camera} (the camera
+        node's name) and {index}.
+        """
+        try:
+            if not cameras:
+                raise ValueError("No cameras given")
+            camera_nodes = []
+            for camera_path in cameras:
+                camera = self._node(camera_path)
+                if not camera:
+                    raise ValueError(f"Camera not found: {camera_path}")
+                camera_nodes.append(camera)
+            
+            # Generate output template if not provided
+            if not output_template:
+                output_template = f"{self._get_temp_dir()}/houdinimcp_render_{{camera}}.exr"
+            
+            rop_type = _RENDERER_ROP_TYPES.get(renderer.lower(), "ifd")
+            merge = self._get_rop("merge", "render_views")
+            
+            images = []
+            with _batch_scene_edit():
+                for index, (camera_path, camera) in enumerate(zip(cameras, camera_nodes)):
+                    output_path = output_template.format(camera=camera.name(), index=index)
+                    # Ensure path has an extension
+                    if not output_path.endswith(_RENDER_EXTS):
+                        output_path += ".exr"
+                    
+                    rop = self._get_rop(rop_type, f"{rop_type}_view{index}")
+                    self._configure_render_rop(rop, rop_type, output_path, camera_path, resolution)
+                    merge.setInput(index, rop)
+                    images.append({"camera": camera_path, "file_path": output_path})
+                
+                # Unhook views left over from an earlier call with more cameras
+                for index in range(len(merge.inputs()) - 1, len(cameras) - 1, -1):
+                    merge.setInput(index, None)
+            
+            frame = hou.frame()
+            merge.render(frame_range=(frame, frame))
             
             return {
                 "success": True,
-                "file_path": output_path,
                 "renderer": renderer,
-                "resolution": resolution or [rop.evalParm("res_overridex"), rop.evalParm("res_overridey")]
+                "frame": frame,
+                "images": images
             }
         except Exception as e:
-            print(f"Error in render_scene: {str(e)}")
-            traceback.print_exc()
+            _log.exception("Error in render_scene_multi: %s", e)
             return {"error": str(e)}
 
     def _get_viewer_info(self, tab) -> Dict[str, Any]:
@@ -1613,37 +2611,32 @@ class HoudiniMCPServer:
 
     def _find_viewer(self, viewer_name: Optional[str] = None):
         """Find a viewer tab, optionally by name. Returns (tab, pane) or (None, None)."""
-        desktop = hou.ui.curDesktop()
-        scene_viewers = []
-        cop_viewers = []
-
-        for pane in desktop.panes():
-            for tab in pane.tabs():
-                if tab.type() == hou.paneTabType.SceneViewer:
-                    scene_viewers.append((tab, pane))
-                elif tab.type() == hou.paneTabType.CompositorViewer:
-                    cop_viewers.append((tab, pane))
-
-        all_viewers = scene_viewers + cop_viewers
+        viewer_types = (hou.paneTabType.SceneViewer, hou.paneTabType.CompositorViewer)
 
         # If a name was given, match by tab name
         if viewer_name:
-            for tab, pane in all_viewers:
-                if tab.name() == viewer_name:
-                    return tab, pane
-            return None, None
+            tab = hou.ui.findPaneTab(viewer_name)
+            if tab is None or tab.type() not in viewer_types:
+                return None, None
+            return tab, tab.pane()
 
         # Default: first scene viewer, then first COP viewer
-        if scene_viewers:
-            return scene_viewers[0]
-        if cop_viewers:
-            return cop_viewers[0]
+        for viewer_type in viewer_types:
+            tab = hou.ui.paneTabOfType(viewer_type)
+            if tab is not None:
+                return tab, tab.pane()
         return None, None
 
     def screenshot_viewport(self,
                            output_path: Optional[str] = None,
-                           viewer_name: Optional[str] = None) -> Dict[str, Any]:
-        """Take a screenshot of the current viewport with panel awareness."""
+                           viewer_name: Optional[str] = None,
+                           background: bool = False) -> Dict[str, Any]:
+        """Take a screenshot of the current viewport with panel awareness.
+
+        With background set, the flipbook runs on the next UI event loop
+        pass and the reply comes back straight away with pending=True;
+        check_screenshot reports when the file has been written.
+        """
         try:
             # Determine if this is a temp file (auto-cleanup candidate)
             is_temp = output_path is None
@@ -1652,7 +2645,7 @@ class HoudiniMCPServer:
                 os.close(fd)  # close fd, flipbook will write to the path
             else:
                 # Ensure the path has an image extension
-                if not any(output_path.endswith(ext) for ext in [".png", ".jpg", ".jpeg"]):
+                if not output_path.endswith(_SCREENSHOT_EXTS):
                     output_path += ".png"
 
             # Find the viewer
@@ -1676,16 +2669,33 @@ class HoudiniMCPServer:
                 flipbook_settings = tab.flipbookSettings().stash()
                 flipbook_settings.output(output_path)
                 flipbook_settings.outputToMPlay(False)
-                flipbook_settings.frameRange((hou.frame(), hou.frame()))
-                tab.flipbook(tab.curViewport(), settings=flipbook_settings)
+                current_frame = hou.frame()
+                flipbook_settings.frameRange((current_frame, current_frame))
 
-                return {
+                result = {
                     "success": True,
                     "file_path": output_path,
                     "is_temp": is_temp,
-                    "frame": hou.frame(),
+                    "frame": current_frame,
                     "viewer": viewer_info,
                 }
+                if background:
+                    future = Future()
+
+                    def capture():
+                        try:
+                            tab.flipbook(tab.curViewport(), settings=flipbook_settings)
+                            future.set_result(None)
+                        except Exception as e:
+                            _log.exception("Error in deferred screenshot: %s", e)
+                            future.set_exception(e)
+
+                    self._screenshots[output_path] = (future, result)
+                    hou.ui.postEventCallback(capture)
+                    return dict(result, pending=True)
+
+                tab.flipbook(tab.curViewport(), settings=flipbook_settings)
+                return result
 
             elif tab.type() == hou.paneTabType.CompositorViewer:
                 # Clean up temp file since we can't use it
@@ -1707,70 +2717,101 @@ class HoudiniMCPServer:
                 }
 
         except Exception as e:
-            print(f"Error in screenshot_viewport: {str(e)}")
-            traceback.print_exc()
+            _log.exception("Error in screenshot_viewport: %s", e)
+            return {"error": str(e)}
+
+    def check_screenshot(self, file_path: str) -> Dict[str, Any]:
+        """Report on a screenshot_viewport call made with background=True"""
+        try:
+            pending = self._screenshots.get(file_path)
+            if pending is None:
+                raise ValueError(f"No deferred screenshot for: {file_path}")
+            future, result = pending
+            if not future.done():
+                return dict(result, pending=True)
+
+            # Finished screenshots are reported once, then forgotten
+            del self._screenshots[file_path]
+            error = future.exception()
+            if error is not None:
+                return {"success": False, "error": str(error), "viewer": result["viewer"]}
+            return result
+        except Exception as e:
+            _log.exception("Error in check_screenshot: %s", e)
             return {"error": str(e)}
 
     def render_cop(self,
                    node_path: str,
                    output_path: Optional[str] = None,
-                   frame: Optional[int] = None) -> Dict[str, Any]:
+                   frame: Optional[int] = None,
+                   background: bool = False) -> Dict[str, Any]:
         """Render a COP node output to an image file.
 
         Tries Copernicus node.saveImage() first (H20.5+), falls back to
-        a Composite ROP for legacy COP2 networks.
+        a Composite ROP for legacy COP2 networks. With background set, the
+        image is written by a separate hython process and must go to
+        output_path; get_job_status then reports which method was used.
         """
         try:
-            node = hou.node(node_path)
+            node = self._node(node_path)
             if not node:
                 raise ValueError(f"Node not found: {node_path}")
 
             is_temp = output_path is None
             if is_temp:
+                if background:
+                    # Nothing would ever read the temp file back or remove it
+                    raise ValueError("background COP renders need an output_path")
                 fd, output_path = tempfile.mkstemp(suffix=".png", prefix="houdini_mcp_cop_")
                 os.close(fd)
             else:
-                if not any(output_path.endswith(ext) for ext in [".png", ".jpg", ".jpeg", ".exr", ".tif", ".tiff"]):
+                if not output_path.endswith(_COP_EXTS):
                     output_path += ".png"
 
             if frame is not None:
                 hou.setFrame(frame)
+            current_frame = hou.frame()
+            settings = {
+                "coppath": node_path,
+                "copoutput": output_path,
+                "trange": 0,  # current frame
+            }
+
+            result = {
+                "success": True,
+                "file_path": output_path,
+                "is_temp": is_temp,
+                "frame": current_frame
+            }
+            if background:
+                # The Composite ROP is configured up front, in case
+                # saveImage() can't write the image in the hython process
+                comp_rop = self._get_rop("comp")
+                with _batch_scene_edit():
+                    comp_rop.setParms(settings)
+                result["job_id"] = self._spawn_job(
+                    {"cop": node_path, "output": output_path, "rop": comp_rop.path()})
+                result["status"] = "running"
+                return result
 
             # Try Copernicus saveImage (H20.5+ / Copernicus COP nodes)
             if hasattr(node, "saveImage"):
                 try:
                     node.saveImage(output_path)
-                    return {
-                        "success": True,
-                        "file_path": output_path,
-                        "is_temp": is_temp,
-                        "method": "copernicus_saveImage",
-                        "frame": hou.frame()
-                    }
+                    result["method"] = "copernicus_saveImage"
+                    return result
                 except Exception:
                     pass  # fall through to ROP method
 
-            # Fallback: use a Composite ROP for COP2 networks
-            rop = hou.node("/out") or hou.node("/").createNode("out")
-            comp_rop = rop.createNode("comp")
-
-            comp_rop.parm("coppath").set(node_path)
-            comp_rop.parm("copoutput").set(output_path)
-            comp_rop.parm("trange").set(0)  # current frame
-
+            # Fallback: use the cached Composite ROP for COP2 networks
+            comp_rop = self._get_rop("comp")
+            with _batch_scene_edit():
+                comp_rop.setParms(settings)
             comp_rop.parm("execute").pressButton()
-            comp_rop.destroy()
-
-            return {
-                "success": True,
-                "file_path": output_path,
-                "is_temp": is_temp,
-                "method": "composite_rop",
-                "frame": hou.frame()
-            }
+            result["method"] = "composite_rop"
+            return result
         except Exception as e:
-            print(f"Error in render_cop: {str(e)}")
-            traceback.print_exc()
+            _log.exception("Error in render_cop: %s", e)
             return {"error": str(e)}
 
 # Initialize the plugin
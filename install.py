@@ -14,7 +14,9 @@ import json
 import os
 import re
 import sys
-import glob
+
+# Version number in a prefs folder name, e.g. "20.5" in "houdini20.5"
+_HOUDINI_VER_RE = re.compile(r'(\d+(?:\.\d+)*)')
 
 HOOK_START = "# --- HoudiniMCP auto-start hook ---"
 HOOK_END = "# --- end HoudiniMCP hook ---"
@@ -37,6 +39,40 @@ if _mcp_os.environ.get("HOUDINIMCP_AUTO_START") == "1":
 """
 
 
+def _atomic_write(path, data):
+    """Replace path with data, never leaving a half-written file behind.
+
+    Houdini may pick up startup scripts while we write them, so the
+    content goes to a temporary file next to path first and is then
+    swapped in with os.replace().
+    """
+    tmp_path = path + ".tmp"
+    view = memoryview(data.encode("utf-8"))
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+
+def _find_hook(content):
+    """Return (start, end) offsets of the hook block in content, or (-1, -1).
+
+    The end marker is only searched for after the start marker, and a
+    block missing its end marker counts as no block.
+    """
+    start_idx = content.find(HOOK_START)
+    if start_idx == -1:
+        return -1, -1
+    end_idx = content.find(HOOK_END, start_idx + len(HOOK_START))
+    if end_idx == -1:
+        return -1, -1
+    return start_idx, end_idx + len(HOOK_END)
+
+
 def find_houdini_pref_dir():
     """Auto-detect the Houdini user preferences directory."""
     env_dir = os.environ.get("HOUDINI_USER_PREF_DIR")
@@ -51,20 +87,27 @@ def find_houdini_pref_dir():
     # Find all houdini* directories and pick the highest numeric version
     def _version_key(path):
         name = os.path.basename(path)
-        m = re.search(r'(\d+(?:\.\d+)*)', name)
+        m = _HOUDINI_VER_RE.search(name)
         if m:
             return tuple(int(x) for x in m.group(1).split('.'))
         return (0,)
 
-    candidates = sorted(
-        [c for c in glob.glob(os.path.join(docs, "houdini*")) if os.path.isdir(c)],
-        key=_version_key,
-        reverse=True,
-    )
-    for c in candidates:
-        return c
+    # One directory pass, keeping the best match so far (ties go to the
+    # first one seen)
+    best, best_key = None, None
+    try:
+        entries = os.scandir(docs)
+    except OSError:
+        return None
+    with entries:
+        for entry in entries:
+            if not entry.name.startswith("houdini") or not entry.is_dir():
+                continue
+            key = _version_key(entry.path)
+            if best_key is None or key > best_key:
+                best, best_key = entry.path, key
 
-    return None
+    return best
 
 
 def write_package(pref_dir, repo_root, dry_run=False):
@@ -88,8 +131,7 @@ def write_package(pref_dir, repo_root, dry_run=False):
         return
 
     os.makedirs(pkg_dir, exist_ok=True)
-    with open(pkg_path, "w") as f:
-        json.dump(pkg_data, f, indent=4)
+    _atomic_write(pkg_path, json.dumps(pkg_data, separators=(",", ":")))
     print(f"[OK] Package written: {pkg_path}")
 
 
@@ -104,9 +146,8 @@ def patch_startup_script(pref_dir, script_name, dry_run=False):
             existing_content = f.read()
 
     # If markers exist, replace the block
-    if HOOK_START in existing_content:
-        start_idx = existing_content.index(HOOK_START)
-        end_idx = existing_content.index(HOOK_END) + len(HOOK_END)
+    start_idx, end_idx = _find_hook(existing_content)
+    if start_idx != -1:
         new_content = existing_content[:start_idx] + HOOK_BLOCK.rstrip() + existing_content[end_idx:]
         action = "replaced"
     else:
@@ -121,8 +162,7 @@ def patch_startup_script(pref_dir, script_name, dry_run=False):
         return
 
     os.makedirs(scripts_dir, exist_ok=True)
-    with open(script_path, "w") as f:
-        f.write(new_content)
+    _atomic_write(script_path, new_content)
     print(f"[OK] Hook {action} in: {script_path}")
 
 
@@ -149,13 +189,11 @@ def remove_hook(pref_dir, script_name, dry_run=False):
     with open(script_path, "r") as f:
         content = f.read()
 
-    if HOOK_START not in content:
+    start_idx, end_idx = _find_hook(content)
+    if start_idx == -1:
         print(f"[SKIP] No HoudiniMCP hook found in: {script_path}")
         return
 
-    start_idx = content.index(HOOK_START)
-    end_idx = content.index(HOOK_END) + len(HOOK_END)
-
     # Remove the block and any surrounding blank lines
     before = content[:start_idx].rstrip("\n")
     after = content[end_idx:].lstrip("\n")
@@ -168,8 +206,7 @@ def remove_hook(pref_dir, script_name, dry_run=False):
     if dry_run:
         print(f"[DRY RUN] Would remove hook from: {script_path}")
     else:
-        with open(script_path, "w") as f:
-            f.write(new_content)
+        _atomic_write(script_path, new_content)
         print(f"[OK] Hook removed from: {script_path}")
 
 
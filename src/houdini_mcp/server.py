@@ -2,108 +2,378 @@ from mcp.server.fastmcp import FastMCP, Context, Image
 import socket
 import json
 import asyncio
+import functools
+import inspect
 import logging
 import os
 import sys
 import platform
+import re
+import struct
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from contextlib import asynccontextmanager
-from typing import AsyncIterator, Dict, Any, List, Optional
+from typing import AsyncIterator, Callable, Dict, Any, List, Optional, Set, Tuple
+
+try:
+    import orjson  # Optional: much faster (de)serialization of large replies
+except ImportError:
+    orjson = None
+
+try:
+    import lz4.frame as lz4_frame  # Optional: compresses large messages
+except ImportError:
+    lz4_frame = None
+
+try:
+    import msgpack  # Optional: binary message bodies, cheaper than JSON
+except ImportError:
+    msgpack = None
+
+try:
+    import psutil  # Optional: lists live processes in one call on every platform
+except ImportError:
+    psutil = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("HoudiniMCPServer")
 
+# Wire framing shared with the addon: a 4-byte big-endian length, then the
+# UTF-8 JSON payload. Each connection opens with a bare JSON hello, and only
+# frames its commands once the addon's reply says it reads frames; addons
+# from before framing get bare JSON throughout. A reply starting with "{" is
+# bare JSON; a length of 0xFFFFFFFF starts a chunked reply made of
+# length-prefixed chunks and ended by a zero-length chunk.
+_HEADER = struct.Struct('>I')
+_LEGACY_START = ord('{')
+_STREAM_SENTINEL = 0xFFFFFFFF
+
+# After both sides agree to it with "hello", a frame body may be LZ4
+# compressed, flagged by the top bit of its length word. Commands of at
+# least _COMPRESS_MIN_SIZE bytes are compressed.
+_COMPRESSED_FLAG = 0x80000000
+_COMPRESS_MIN_SIZE = 4096
+
+# hello can also switch message bodies from JSON to MessagePack, starting
+# with the first message after the hello reply
+_PACKED_ENCODING = "msgpack"
+
+# Socket buffers sized so a large scene dump arrives in few recv calls
+_SOCKET_BUFFER_SIZE = 1 << 20
+
+# A connection that answered within this many seconds is reused without
+# another liveness check
+_HEALTH_CHECK_INTERVAL = 5.0
+
+# How long to wait for Houdini to connect or answer one command. Liveness
+# checks fail fast; renders, exports, hip file I/O and user code get the
+# long limit, and simulations a budget per frame.
+_RESPONSE_TIMEOUT = 15.0
+_PING_TIMEOUT = 2.0
+_LONG_TIMEOUT = 600.0
+_SIM_FRAME_TIMEOUT = 10.0
+
+# Most sockets kept open to a single Houdini instance
+_MAX_POOL_CONNECTIONS = 4
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment, ignoring bad values."""
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        logger.warning("Ignoring non-integer %s=%r", name, os.environ[name])
+        return default
+
+
+# Connections opened to Houdini at startup, ready for the first tool calls
+_PREWARM_CONNECTIONS = _env_int("HOUDINIMCP_PREWARM", 2)
+
+
+def _json_dumps(obj) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, with orjson when it's installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass  # e.g. ints past 64 bits; json copes with those
+    return json.dumps(obj).encode('utf-8')
+
+
+def _json_loads(data):
+    """Parse JSON from bytes or str, with orjson when it's installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_text(obj) -> str:
+    """Format obj as compact JSON text for a tool reply.
+
+    No indentation: the model reads compact JSON just as well, and large
+    scene dumps come out smaller and faster.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode('utf-8')
+        except TypeError:
+            pass
+    return json.dumps(obj, separators=(',', ':'))
+
+
+class HoudiniError(Exception):
+    """Houdini received a command and answered that it failed."""
+
+
+class _JsonEndScanner:
+    """Find where a bare JSON object ends as its bytes arrive.
+
+    Tracks bracket depth and string/escape state across chunks, so every
+    byte is looked at once no matter how many chunks the reply spans. A
+    regex walks the chunk token by token in C: each complete string is
+    consumed in one match, and only brackets and strings cut off by the
+    end of a chunk need Python-level handling.
+    """
+    __slots__ = ("depth", "in_string", "escape")
+
+    # A complete string, a bracket, or (failing both) a string left open
+    _TOKENS = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}]|"', re.DOTALL)
+    _STRING_STOP = re.compile(rb'[\\"]')
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+
+    def feed(self, chunk: bytes) -> int:
+        """Scan chunk; return the offset just past the closing brace, or -1."""
+        pos = 0
+        if self.in_string:
+            pos = self._finish_string(chunk, 0)
+            if pos < 0:
+                return -1
+        for match in self._TOKENS.finditer(chunk, pos):
+            start, end = match.span()
+            byte = chunk[start]
+            if byte == 0x22:  # quote
+                if end - start == 1:
+                    # Opened here, closed in a later chunk
+                    self.in_string = True
+                    self._finish_string(chunk, end)
+                    return -1
+            elif byte == 0x7B or byte == 0x5B:  # { [
+                self.depth += 1
+            else:  # } ]
+                self.depth -= 1
+                if self.depth == 0:
+                    return end
+        return -1
+
+    def _finish_string(self, chunk: bytes, pos: int) -> int:
+        """Look for the end of an open string; return the offset past it, or -1."""
+        if self.escape:
+            if pos >= len(chunk):
+                return -1
+            pos += 1  # The character escaped by the previous chunk's backslash
+            self.escape = False
+        while True:
+            match = self._STRING_STOP.search(chunk, pos)
+            if match is None:
+                return -1
+            pos = match.end()
+            if chunk[match.start()] == 0x22:  # closing quote
+                self.in_string = False
+                return pos
+            if pos >= len(chunk):  # backslash at the very end
+                self.escape = True
+                return -1
+            pos += 1
+
 @dataclass
 class HoudiniConnection:
     host: str
     port: int
-    sock: socket.socket = None
+    reader: asyncio.StreamReader = None
+    writer: asyncio.StreamWriter = None
+    last_ok: float = 0.0  # time.monotonic() of the last successful reply
+    framed: bool = False  # the addon reads length-prefixed commands
+    compression: Optional[str] = None  # agreed with the addon on connect
+    encoding: Optional[str] = None  # "msgpack" when agreed, else JSON
     
-    def connect(self) -> bool:
+    async def connect(self) -> bool:
         """Connect to the Houdini addon socket server"""
-        if self.sock:
+        if self.writer:
             return True
             
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         try:
-            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.sock.connect((self.host, self.port))
-            logger.info(f"Connected to Houdini at {self.host}:{self.port}")
-            return True
+            self._tune_socket(sock)
+            sock.setblocking(False)
+            await asyncio.wait_for(
+                asyncio.get_running_loop().sock_connect(sock, (self.host, self.port)),
+                _RESPONSE_TIMEOUT)
+            self.reader, self.writer = await asyncio.open_connection(
+                sock=sock, limit=_SOCKET_BUFFER_SIZE)
+            logger.info("Connected to Houdini at %s:%s", self.host, self.port)
         except Exception as e:
-            logger.error(f"Failed to connect to Houdini: {str(e)}")
-            self.sock = None
+            logger.error("Failed to connect to Houdini: %s", e)
+            sock.close()
+            self.reader = self.writer = None
             return False
+        await self._negotiate()
+        return self.writer is not None
+
+    async def _negotiate(self):
+        """Agree on framing and optional wire features; older addons just decline.
+
+        hello goes out as bare JSON, which every addon version reads. An
+        addon from before framing answers that it doesn't know the command,
+        and the connection keeps sending bare JSON.
+        """
+        self.framed = False
+        self.compression = self.encoding = None
+        offer = {"framing": True}
+        if lz4_frame is not None:
+            offer["compression"] = ["lz4"]
+        if msgpack is not None:
+            offer["encoding"] = [_PACKED_ENCODING]
+        try:
+            result = await self.send_command("hello", offer)
+            if result.get("framing"):
+                self.framed = True
+                self.compression = result.get("compression")
+                # Addons from before encodings were offered leave this out
+                self.encoding = result.get("encoding")
+        except HoudiniError:
+            pass  # An addon from before hello existed
+        except Exception as e:
+            logger.warning("Could not negotiate with Houdini: %s", e)
+        if not self.framed:
+            logger.info("Houdini addon predates framing; sending bare JSON")
+        if self.compression:
+            logger.info("Using %s compression with Houdini", self.compression)
+        if self.encoding:
+            logger.info("Using %s messages with Houdini", self.encoding)
     
+    @staticmethod
+    def _tune_socket(sock):
+        """Configure a new socket for small request / large reply traffic.
+
+        Called before connecting, so the receive buffer size is in place
+        when TCP agrees on a window size.
+        """
+        try:
+            # Commands are written in one go; don't let Nagle hold them back
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, _SOCKET_BUFFER_SIZE)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _SOCKET_BUFFER_SIZE)
+        except OSError as e:
+            logger.warning("Could not tune Houdini socket: %s", e)
+
     def disconnect(self):
         """Disconnect from the Houdini addon"""
-        if self.sock:
+        if self.writer:
             try:
-                self.sock.close()
+                self.writer.close()
             except Exception as e:
-                logger.error(f"Error disconnecting from Houdini: {str(e)}")
+                logger.error("Error disconnecting from Houdini: %s", e)
             finally:
-                self.sock = None
+                self.reader = self.writer = None
+
+    async def receive_full_response(self, reader, buffer_size=8192):
+        """Receive one complete response.
 
-    def receive_full_response(self, sock, buffer_size=8192):
-        """Receive the complete response, potentially in multiple chunks"""
-        chunks = []
-        sock.settimeout(15.0)  # Socket timeout
+        Framed replies are read as one block of the announced size and
+        parsed once by the caller. Bare JSON replies from older addons fall
+        back to _receive_legacy_response.
+        """
+        sock = self.writer.get_extra_info('socket')
+        if sock is not None and hasattr(socket, 'TCP_QUICKACK'):  # Linux only; the kernel clears it again
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+            except OSError:
+                pass
         
-        try:
+        first = await reader.readexactly(1)
+        if first[0] == _LEGACY_START:
+            return await self._receive_legacy_response(reader, first, buffer_size)
+        (length,) = _HEADER.unpack(first + await reader.readexactly(_HEADER.size - 1))
+        
+        if length == _STREAM_SENTINEL:
+            chunks = []
             while True:
-                try:
-                    chunk = sock.recv(buffer_size)
-                    if not chunk:
-                        # If we get an empty chunk, the connection might be closed
-                        if not chunks:  # If we haven't received anything yet, this is an error
-                            raise Exception("Connection closed before receiving any data")
-                        break
-                    
-                    chunks.append(chunk)
-                    
-                    # Check if we've received a complete JSON object
-                    try:
-                        data = b''.join(chunks)
-                        json.loads(data.decode('utf-8'))
-                        # If we get here, it parsed successfully
-                        logger.info(f"Received complete response ({len(data)} bytes)")
-                        return data
-                    except json.JSONDecodeError:
-                        # Incomplete JSON, continue receiving
-                        continue
-                except socket.timeout:
-                    # If we hit a timeout during receiving, break the loop and try to use what we have
-                    logger.warning("Socket timeout during chunked receive")
+                (length,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+                if not length:
                     break
-                except (ConnectionError, BrokenPipeError, ConnectionResetError) as e:
-                    logger.error(f"Socket connection error during receive: {str(e)}")
-                    raise  # Re-raise to be handled by the caller
-        except socket.timeout:
-            logger.warning("Socket timeout during chunked receive")
-        except Exception as e:
-            logger.error(f"Error during receive: {str(e)}")
-            raise
-            
-        # If we get here, we either timed out or broke out of the loop
-        # Try to use what we have
-        if chunks:
+                chunks.append(await self._read_body(reader, length))
             data = b''.join(chunks)
-            logger.info(f"Returning data after receive completion ({len(data)} bytes)")
-            try:
-                # Try to parse what we have
-                json.loads(data.decode('utf-8'))
-                return data
-            except json.JSONDecodeError:
-                # If we can't parse it, it's incomplete
-                raise Exception("Incomplete JSON response received")
         else:
-            raise Exception("No data received")
-
-    def send_command(self, command_type: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Send a command to Houdini and return the response"""
-        if not self.sock and not self.connect():
+            data = await self._read_body(reader, length)
+        
+        logger.info("Received complete response (%d bytes)", len(data))
+        return data
+
+    @staticmethod
+    async def _read_body(reader, length: int) -> bytes:
+        """Read one frame body, decompressing it if its length word says so"""
+        if length & _COMPRESSED_FLAG:
+            return lz4_frame.decompress(await reader.readexactly(length & ~_COMPRESSED_FLAG))
+        return await reader.readexactly(length)
+
+    def _frame(self, command: Dict[str, Any]) -> bytes:
+        """Encode a command as one length-prefixed frame, or as bare JSON
+        until the addon has confirmed it reads frames"""
+        if not self.framed:
+            return _json_dumps(command)
+        payload = msgpack.packb(command) if self.encoding else _json_dumps(command)
+        if self.compression and len(payload) >= _COMPRESS_MIN_SIZE:
+            payload = lz4_frame.compress(payload)
+            return _HEADER.pack(len(payload) | _COMPRESSED_FLAG) + payload
+        return _HEADER.pack(len(payload)) + payload
+
+    def _decode(self, data: bytes):
+        """Parse a reply body in the encoding agreed for this connection"""
+        if self.encoding:
+            return msgpack.unpackb(data, strict_map_key=False)
+        return _json_loads(data)
+
+    async def _receive_legacy_response(self, reader, first: bytes, buffer_size=8192):
+        """Receive a bare JSON reply from an addon that doesn't frame its replies.
+
+        Each chunk is scanned once for the brace that closes the reply, and
+        the whole reply is parsed once by the caller.
+        """
+        scanner = _JsonEndScanner()
+        chunks = [first]
+        end = scanner.feed(first)
+        
+        try:
+            while end < 0:
+                chunk = await reader.read(buffer_size)
+                if not chunk:
+                    raise ConnectionError("Connection closed before the response was complete")
+                chunks.append(chunk)
+                end = scanner.feed(chunk)
+        except (ConnectionError, BrokenPipeError, ConnectionResetError) as e:
+            logger.error("Socket connection error during receive: %s", e)
+            raise  # Re-raise to be handled by the caller
+        
+        data = b''.join(chunks)
+        logger.info("Received complete response (%d bytes)", len(data))
+        return data
+
+    async def send_command(self, command_type: str, params: Dict[str, Any] = None,
+                           timeout: Optional[float] = _RESPONSE_TIMEOUT) -> Dict[str, Any]:
+        """Send a command to Houdini and return the response.
+
+        timeout bounds the wait for the reply, in seconds; None waits as
+        long as Houdini takes.
+        """
+        if not self.writer and not await self.connect():
             raise ConnectionError("Not connected to Houdini")
         
         command = {
@@ -113,45 +383,128 @@ class HoudiniConnection:
         
         try:
             # Log the command being sent
-            logger.info(f"Sending command: {command_type} with params: {params}")
+            # %-style arguments: params are only formatted (and cut to 200
+            # characters) when INFO logging is actually on
+            logger.info("Sending command: %s with params: %.200s", command_type, params)
             
-            # Send the command
-            self.sock.sendall(json.dumps(command).encode('utf-8'))
-            logger.info(f"Command sent, waiting for response...")
+            # Send the command, length-prefixed
+            self.writer.write(self._frame(command))
+            await self.writer.drain()
+            logger.info("Command sent, waiting for response...")
             
-            # Set a timeout for receiving
-            self.sock.settimeout(15.0)
+            # Wait for the response without blocking other tool calls
+            response_data = await asyncio.wait_for(
+                self.receive_full_response(self.reader), timeout)
+            logger.info("Received %d bytes of data", len(response_data))
             
-            # Receive the response using the improved receive_full_response method
-            response_data = self.receive_full_response(self.sock)
-            logger.info(f"Received {len(response_data)} bytes of data")
+            response = self._decode(response_data)
+            logger.info("Response parsed, status: %s", response.get('status', 'unknown'))
             
-            response = json.loads(response_data.decode('utf-8'))
-            logger.info(f"Response parsed, status: {response.get('status', 'unknown')}")
+            # Any reply, even an error, shows the connection is alive
+            self.last_ok = time.monotonic()
             
             if response.get("status") == "error":
-                logger.error(f"Houdini error: {response.get('message')}")
-                raise Exception(response.get("message", "Unknown error from Houdini"))
+                logger.error("Houdini error: %s", response.get('message'))
+                raise HoudiniError(response.get("message", "Unknown error from Houdini"))
             
             return response.get("result", {})
-        except socket.timeout:
+        except HoudiniError:
+            raise  # The connection itself is fine; keep it
+        except asyncio.TimeoutError:
             logger.error("Socket timeout while waiting for response from Houdini")
-            self.sock = None
+            self.disconnect()
             raise Exception("Timeout waiting for Houdini response - try simplifying your request")
-        except (ConnectionError, BrokenPipeError, ConnectionResetError) as e:
-            logger.error(f"Socket connection error: {str(e)}")
-            self.sock = None
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            logger.error("Socket connection error: %s", e)
+            self.disconnect()
             raise Exception(f"Connection to Houdini lost: {str(e)}")
         except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON response from Houdini: {str(e)}")
+            logger.error("Invalid JSON response from Houdini: %s", e)
             # Try to log what was received
             if 'response_data' in locals() and response_data:
-                logger.error(f"Raw response (first 200 bytes): {response_data[:200]}")
+                logger.error("Raw response (first 200 bytes): %s", response_data[:200])
             raise Exception(f"Invalid response from Houdini: {str(e)}")
         except Exception as e:
-            logger.error(f"Error communicating with Houdini: {str(e)}")
-            self.sock = None
+            logger.error("Error communicating with Houdini: %s", e)
+            self.disconnect()
             raise Exception(f"Communication error with Houdini: {str(e)}")
+        except BaseException:
+            # Cancelled mid-exchange (e.g. the tool call was abandoned): the
+            # reply may still arrive, and the next caller would read it as
+            # its own
+            self.disconnect()
+            raise
+
+
+class _ConnectionPool:
+    """Warm connections to one Houdini instance, lent out one caller at a time.
+
+    Connections are opened on demand up to max_connections, so that many
+    tool calls can be waiting on Houdini at once. A connection that lost
+    its socket is dropped on release instead of being reused, and an idle
+    one Houdini has since closed (e.g. the addon was restarted) is dropped
+    before it is lent out.
+    """
+
+    def __init__(self, host: str, port: int, max_connections: int = _MAX_POOL_CONNECTIONS):
+        self.host = host
+        self.port = port
+        self._idle: List[HoudiniConnection] = []  # most recently used last
+        self._max_connections = max_connections
+        self._slots = asyncio.Semaphore(max_connections)
+        self.last_ok = 0.0  # newest last_ok of any connection returned
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[HoudiniConnection]:
+        """Borrow an idle connection, or open a new one if there is a free slot"""
+        async with self._slots:
+            conn = self._take_idle()
+            if not await conn.connect():
+                raise ConnectionError(f"Could not connect to Houdini on port {self.port}")
+            try:
+                yield conn
+            finally:
+                self.release(conn)
+
+    def _take_idle(self) -> HoudiniConnection:
+        """Pop the newest idle connection that is still open, else make a new one"""
+        while self._idle:
+            conn = self._idle.pop()
+            if not (conn.writer.is_closing() or conn.reader.at_eof()):
+                return conn
+            conn.disconnect()
+        return HoudiniConnection(self.host, self.port)
+
+    def release(self, conn: HoudiniConnection):
+        """Hand a connection back to the pool"""
+        self.last_ok = max(self.last_ok, conn.last_ok)
+        if conn.writer and len(self._idle) < self._max_connections:
+            self._idle.append(conn)
+        else:
+            conn.disconnect()
+
+    async def warm(self, count: int):
+        """Open connections concurrently until count of them sit idle"""
+        count = min(count, self._max_connections) - len(self._idle)
+        if count <= 0:
+            return
+        new = [HoudiniConnection(self.host, self.port) for _ in range(count)]
+        connected = await asyncio.gather(*(conn.connect() for conn in new))
+        self._idle.extend(conn for conn, ok in zip(new, connected) if ok)
+        logger.info("%d warm connection(s) to Houdini on port %s", len(self._idle), self.port)
+
+    async def send_command(self, command_type: str, params: Dict[str, Any] = None,
+                           timeout: Optional[float] = _RESPONSE_TIMEOUT) -> Dict[str, Any]:
+        """Send a command over a pooled connection and return the response"""
+        async with self.acquire() as conn:
+            return await conn.send_command(command_type, params, timeout)
+
+    def close(self):
+        """Disconnect every idle connection"""
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.disconnect()
+
 
 @asynccontextmanager
 async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
@@ -162,21 +515,24 @@ async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
         
         # Try to connect to Houdini on startup
         try:
-            houdini = get_houdini_connection()
+            houdini = await get_houdini_connection()
+            await houdini.warm(_PREWARM_CONNECTIONS)
             logger.info("Successfully connected to Houdini on startup")
         except Exception as e:
-            logger.warning(f"Could not connect to Houdini on startup: {str(e)}")
+            logger.warning("Could not connect to Houdini on startup: %s", e)
             logger.warning("Make sure the Houdini addon is running before using Houdini resources or tools")
         
         # Return an empty context - we're using the global connection
         yield {}
     finally:
-        # Clean up the global connection on shutdown
-        global _houdini_connection
-        if _houdini_connection:
+        # Clean up the pooled connections on shutdown
+        global _active_pool
+        if _pools:
             logger.info("Disconnecting from Houdini on shutdown")
-            _houdini_connection.disconnect()
-            _houdini_connection = None
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+        _active_pool = None
         logger.info("HoudiniMCP server shut down")
 
 # Create the MCP server with lifespan support
@@ -185,12 +541,63 @@ mcp = FastMCP(
     lifespan=server_lifespan
 )
 
-# Global connection for resources
-_houdini_connection = None
+# Connection pools per (host, port), and the key of the one tools talk to
+_pools: Dict[Tuple[str, int], _ConnectionPool] = {}
+_active_pool: Optional[Tuple[str, int]] = None
 _target_port = None  # Explicitly selected port (via connect_to_houdini)
+_last_good_port: Optional[int] = None  # Last port a pool connected to
+
+# Held while a pool is health-checked or opened, so concurrent tool calls
+# share one ping or connect instead of each making their own. Created on
+# first use, inside the running event loop.
+_connect_lock: Optional[asyncio.Lock] = None
 
 DEFAULT_PORT = 9877  # Backward-compat fallback
 
+# Last port file scan as (time.monotonic(), instances), reused for a short while
+_INSTANCE_CACHE_TTL = 2.0
+_instance_cache: Tuple[float, List[dict]] = (0.0, [])
+
+
+# get_parameter_info replies, keyed by (instance, node path, parameter name or
+# None for the full dump). Agents tend to ask for the same dump several times
+# while composing one edit, so even a short lifetime saves most round trips.
+_PARAM_INFO_CACHE_SIZE = 256
+_PARAM_INFO_CACHE_TTL = 1.0
+_param_info_cache: "OrderedDict[Tuple[Any, str, Optional[str]], Tuple[float, str]]" = OrderedDict()
+
+
+def _cached_param_info(node_path: str, parameter_name: Optional[str]) -> Optional[str]:
+    """Return a recent get_parameter_info reply, or None."""
+    key = (_active_pool, node_path, parameter_name)
+    entry = _param_info_cache.get(key)
+    if entry is None:
+        return None
+    if time.monotonic() - entry[0] >= _PARAM_INFO_CACHE_TTL:
+        del _param_info_cache[key]
+        return None
+    return entry[1]
+
+
+def _remember_param_info(node_path: str, parameter_name: Optional[str], text: str):
+    key = (_active_pool, node_path, parameter_name)
+    _param_info_cache[key] = (time.monotonic(), text)
+    _param_info_cache.move_to_end(key)
+    if len(_param_info_cache) > _PARAM_INFO_CACHE_SIZE:
+        _param_info_cache.popitem(last=False)
+
+
+def _forget_node(node_path: str):
+    """Drop cached parameter info for a node and everything inside it."""
+    prefix = node_path.rstrip("/") + "/"
+    for key in [k for k in _param_info_cache if k[1] == node_path or k[1].startswith(prefix)]:
+        del _param_info_cache[key]
+
+
+def _forget_all_param_info():
+    """Drop all cached parameter info, e.g. after edits this server can't track."""
+    _param_info_cache.clear()
+
 
 def _get_port_file_dir():
     """Get the platform-appropriate directory for instance port files."""
@@ -225,99 +632,253 @@ def _is_pid_alive(pid):
             return False
 
 
+# Port files are a few hundred bytes; read them raw, without a text layer
+_PORT_FILE_FLAGS = os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0) | getattr(os, 'O_BINARY', 0)
+_PORT_FILE_MAX_SIZE = 65536
+
+
+def _read_port_file(path: str) -> Dict[str, Any]:
+    """Read and parse one instance port file."""
+    fd = os.open(path, _PORT_FILE_FLAGS)
+    try:
+        data = os.read(fd, _PORT_FILE_MAX_SIZE)
+    finally:
+        os.close(fd)
+    return _json_loads(data)
+
+
+def _live_pids() -> Optional[Set[int]]:
+    """Return the PIDs of all running processes, or None if they can't be listed.
+
+    One call covers every port file in a scan; callers fall back to
+    _is_pid_alive() per PID when this returns None.
+    """
+    if psutil is not None:
+        try:
+            return set(psutil.pids())
+        except Exception:
+            pass
+    if sys.platform.startswith('linux'):
+        try:
+            return {int(name) for name in os.listdir('/proc') if name.isdigit()}
+        except OSError:
+            pass
+    return None
+
+
 def _discover_instances():
     """Scan port file directory and return list of live Houdini instances.
 
     Each entry is a dict with port, pid, hip_file, etc.
     Returns list sorted by started_at descending (newest first).
-    Cleans up stale port files as a side effect.
+    Cleans up stale port files as a side effect. A scan less than
+    _INSTANCE_CACHE_TTL seconds old is reused.
     """
-    port_dir = _get_port_file_dir()
-    if not os.path.isdir(port_dir):
-        return []
+    global _instance_cache
+    scanned_at, cached = _instance_cache
+    if time.monotonic() - scanned_at < _INSTANCE_CACHE_TTL:
+        return list(cached)
 
     instances = []
-    for fname in os.listdir(port_dir):
-        if not fname.startswith('houdini_') or not fname.endswith('.json'):
-            continue
-        fpath = os.path.join(port_dir, fname)
-        try:
-            with open(fpath, 'r') as f:
-                info = json.load(f)
-            pid = info.get('pid')
-            if pid and not _is_pid_alive(pid):
-                # Stale — clean up
+    alive = None  # live PIDs, listed once the first port file needs them
+    try:
+        entries = os.scandir(_get_port_file_dir())
+    except OSError:
+        entries = None
+    if entries is not None:
+        with entries:
+            for entry in entries:
+                fname = entry.name
+                if not fname.startswith('houdini_') or not fname.endswith('.json'):
+                    continue
                 try:
-                    os.remove(fpath)
-                    logger.info(f"Cleaned stale port file: {fname}")
+                    info = _read_port_file(entry.path)
+                    pid = info.get('pid')
+                    if pid and alive is None:
+                        alive = _live_pids() or False
+                    if pid and not (pid in alive if alive else _is_pid_alive(pid)):
+                        # Stale — clean up
+                        try:
+                            os.remove(entry.path)
+                            logger.info("Cleaned stale port file: %s", fname)
+                        except Exception:
+                            pass
+                        continue
+                    instances.append(info)
                 except Exception:
-                    pass
-                continue
-            instances.append(info)
-        except Exception:
-            continue
+                    continue
 
     # Sort newest first
     instances.sort(key=lambda x: x.get('started_at', ''), reverse=True)
-    return instances
+    _instance_cache = (time.monotonic(), instances)
+    return list(instances)
+
+
+def _invalidate_instance_cache():
+    """Make the next _discover_instances() call rescan the port files."""
+    global _instance_cache
+    _instance_cache = (0.0, [])
 
 
-def get_houdini_connection():
-    """Get or create a persistent Houdini connection.
+async def _open_pool(port: int) -> Optional[_ConnectionPool]:
+    """Make the pool for port the active one if Houdini answers there."""
+    global _active_pool, _last_good_port
+    key = ("localhost", port)
+    pool = _pools.get(key) or _ConnectionPool(*key)
+    try:
+        async with pool.acquire():
+            pass
+    except ConnectionError:
+        logger.error("Failed to connect to Houdini on port %s", port)
+        pool.close()
+        _pools.pop(key, None)
+        _invalidate_instance_cache()
+        return None
+    _pools[key] = pool
+    _active_pool = key
+    _last_good_port = port
+    logger.info("Using connection pool for Houdini on port %s", port)
+    return pool
+
+
+async def get_houdini_connection() -> _ConnectionPool:
+    """Get or create the connection pool for the current Houdini instance.
+
+    A pool that answered moments ago is returned straight away. Otherwise
+    one caller at a time checks or reconnects, and callers that waited
+    reuse its outcome.
+    """
+    global _connect_lock
+    pool = _pools.get(_active_pool)
+    if pool is not None and time.monotonic() - pool.last_ok < _HEALTH_CHECK_INTERVAL:
+        return pool
+    if _connect_lock is None:
+        _connect_lock = asyncio.Lock()
+    async with _connect_lock:
+        return await _resolve_pool()
+
+
+async def _resolve_pool() -> _ConnectionPool:
+    """Find a working pool; called with _connect_lock held.
 
     Priority:
-    1. Reuse existing healthy connection.
+    1. Reuse the pool of the current instance while it is healthy.
     2. Connect to _target_port if explicitly set (via connect_to_houdini tool).
-    3. Discover instances via port files and connect to the most recent.
-    4. Fallback to DEFAULT_PORT (backward compat with older addon).
+    3. Reconnect to the last port that worked, without scanning port files.
+    4. Discover instances via port files and connect to the most recent.
+    5. Fallback to DEFAULT_PORT (backward compat with older addon).
     """
-    global _houdini_connection, _target_port
-
-    # If we have an existing connection, check if it's still valid
-    if _houdini_connection is not None:
+    global _active_pool, _target_port, _last_good_port
+
+    # If we have an existing pool, check if it's still valid. A pool that
+    # answered moments ago is trusted without asking again.
+    pool = _pools.get(_active_pool)
+    if pool is not None:
+        if time.monotonic() - pool.last_ok < _HEALTH_CHECK_INTERVAL:
+            return pool
         try:
-            _houdini_connection.send_command("get_scene_info")
-            return _houdini_connection
+            await pool.send_command("ping", timeout=_PING_TIMEOUT)
+            return pool
         except Exception as e:
-            logger.warning(f"Existing connection is no longer valid: {str(e)}")
-            try:
-                _houdini_connection.disconnect()
-            except Exception:
-                pass
-            _houdini_connection = None
+            if time.monotonic() - pool.last_ok < _HEALTH_CHECK_INTERVAL:
+                # It answered, just not to ping: an addon from before ping existed
+                return pool
+            logger.warning("Existing connection is no longer valid: %s", e)
+            pool.close()
+            del _pools[_active_pool]
+            _active_pool = None
+            _invalidate_instance_cache()
 
     # Determine which port to connect to
     port = None
 
     if _target_port is not None:
         port = _target_port
-        logger.info(f"Using explicitly targeted port {port}")
+        logger.info("Using explicitly targeted port %s", port)
     else:
+        if _last_good_port is not None:
+            pool = await _open_pool(_last_good_port)
+            if pool is not None:
+                return pool
+            _last_good_port = None
         instances = _discover_instances()
         if instances:
             port = instances[0]['port']
             if len(instances) > 1:
                 logger.info(
-                    f"Found {len(instances)} Houdini instances. "
-                    f"Connecting to most recent on port {port}. "
-                    f"Use list_houdini_instances / connect_to_houdini to switch."
+                    "Found %d Houdini instances. "
+                    "Connecting to most recent on port %s. "
+                    "Use list_houdini_instances / connect_to_houdini to switch.",
+                    len(instances), port
                 )
             else:
-                logger.info(f"Discovered Houdini instance on port {port}")
+                logger.info("Discovered Houdini instance on port %s", port)
 
     if port is None:
         port = DEFAULT_PORT
-        logger.info(f"No port files found, falling back to default port {port}")
+        logger.info("No port files found, falling back to default port %s", port)
 
-    _houdini_connection = HoudiniConnection(host="localhost", port=port)
-    if not _houdini_connection.connect():
-        logger.error(f"Failed to connect to Houdini on port {port}")
-        _houdini_connection = None
+    pool = await _open_pool(port)
+    if pool is None:
         raise Exception(
             "Could not connect to Houdini. Make sure the Houdini addon is running."
         )
-    logger.info(f"Created new persistent connection to Houdini on port {port}")
-    return _houdini_connection
+    return pool
+
+
+def _without_none(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop the optional values a tool was called without.
+
+    Only None counts as missing, so a meaningful 0, False or [0, 0] is
+    still sent.
+    """
+    return {k: v for k, v in params.items() if v is not None}
+
+
+def houdini_tool(command: str, format_ok: Callable[[Dict[str, Any], Dict[str, Any]], Any],
+                 action: str, timeout: Optional[float] = _RESPONSE_TIMEOUT):
+    """Make a tool out of a stub that stands for one Houdini command.
+
+    The stub supplies the tool's signature and docstring. Its arguments,
+    minus ctx and any left at None, are sent as the command's params (see
+    _without_none); a stub that returns a dict sends that instead. The reply is
+    turned into the tool's answer by format_ok(result, arguments), and a
+    failure becomes "Error <action>: ...". Cached parameter info is dropped
+    first, since the command may change any parm (render and export
+    commands configure ROPs).
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        # Worked out once here: MCP calls pass every argument by keyword,
+        # so a call only has to fill in the defaults
+        names = tuple(name for name in signature.parameters if name != "ctx")
+        defaults = {name: p.default for name, p in signature.parameters.items()
+                    if p.default is not inspect.Parameter.empty}
+        required = frozenset(names) - defaults.keys()
+
+        @functools.wraps(func)
+        async def tool(*args, **kwargs):
+            if args or not required <= kwargs.keys():
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                kwargs = bound.arguments
+            arguments = {name: kwargs[name] if name in kwargs else defaults[name]
+                         for name in names}
+            try:
+                houdini = await get_houdini_connection()
+                _forget_all_param_info()
+                params = func(ctx=kwargs.get("ctx"), **arguments)
+                if params is None:
+                    params = _without_none(arguments)
+                result = await houdini.send_command(command, params, timeout=timeout)
+                if "error" in result:
+                    return f"Error {action}: {result['error']}"
+                return format_ok(result, arguments)
+            except Exception as e:
+                logger.error("Error %s: %s", action, e)
+                return f"Error {action}: {str(e)}"
+        return tool
+    return decorator
 
 
 #
@@ -325,21 +886,19 @@ def get_houdini_connection():
 #
 
 @mcp.tool()
-def get_scene_info(ctx: Context) -> str:
+async def get_scene_info(ctx: Context) -> str:
     """Get detailed information about the current Houdini scene"""
     try:
-        houdini = get_houdini_connection()
-        result = houdini.send_command("get_scene_info")
+        houdini = await get_houdini_connection()
+        result = await houdini.send_command("get_scene_info")
         
-        # Format the information in a readable way
-        formatted = json.dumps(result, indent=2)
-        return formatted
+        return _json_text(result)
     except Exception as e:
-        logger.error(f"Error getting scene info from Houdini: {str(e)}")
+        logger.error("Error getting scene info from Houdini: %s", e)
         return f"Error getting scene info: {str(e)}"
 
 @mcp.tool()
-def get_node_info(ctx: Context, path: str) -> str:
+async def get_node_info(ctx: Context, path: str) -> str:
     """
     Get detailed information about a specific node in the Houdini scene.
     
@@ -347,18 +906,16 @@ def get_node_info(ctx: Context, path: str) -> str:
     - path: Full path to the node (e.g., "/obj/geo1")
     """
     try:
-        houdini = get_houdini_connection()
-        result = houdini.send_command("get_node_info", {"path": path})
+        houdini = await get_houdini_connection()
+        result = await houdini.send_command("get_node_info", {"path": path})
         
-        # Format the information in a readable way
-        formatted = json.dumps(result, indent=2)
-        return formatted
+        return _json_text(result)
     except Exception as e:
-        logger.error(f"Error getting node info from Houdini: {str(e)}")
+        logger.error("Error getting node info from Houdini: %s", e)
         return f"Error getting node info: {str(e)}"
 
 @mcp.tool()
-def create_geometry(
+async def create_geometry(
     ctx: Context,
     geo_type: str = "box",
     parent_path: str = "/obj",
@@ -380,22 +937,18 @@ def create_geometry(
     Information about the created geometry.
     """
     try:
-        houdini = get_houdini_connection()
+        houdini = await get_houdini_connection()
         
         # Pass parameters to the Houdini command
-        params = {
+        params = _without_none({
             "geo_type": geo_type,
-            "parent_path": parent_path
-        }
-        
-        if name:
-            params["name"] = name
-        if position:
-            params["position"] = position
-        if parameters:
-            params["parameters"] = parameters
+            "parent_path": parent_path,
+            "name": name,
+            "position": position,
+            "parameters": parameters
+        })
             
-        result = houdini.send_command("create_geometry", params)
+        result = await houdini.send_command("create_geometry", params)
         
         if "error" in result:
             return f"Error creating geometry: {result['error']}"
@@ -403,11 +956,11 @@ def create_geometry(
         # Return a user-friendly message
         return f"Created {geo_type} geometry at {result['path']}"
     except Exception as e:
-        logger.error(f"Error creating geometry: {str(e)}")
+        logger.error("Error creating geometry: %s", e)
         return f"Error creating geometry: {str(e)}"
 
 @mcp.tool()
-def create_node(
+async def create_node(
     ctx: Context,
     node_type: str,
     parent_path: str = "/obj",
@@ -427,20 +980,17 @@ def create_node(
     Information about the created node.
     """
     try:
-        houdini = get_houdini_connection()
+        houdini = await get_houdini_connection()
         
         # Pass parameters to the Houdini command
-        params = {
+        params = _without_none({
             "node_type": node_type,
-            "parent_path": parent_path
-        }
-        
-        if name:
-            params["node_name"] = name
-        if position:
-            params["position"] = position
+            "parent_path": parent_path,
+            "node_name": name,
+            "position": position
+        })
             
-        result = houdini.send_command("create_node", params)
+        result = await houdini.send_command("create_node", params)
         
         if "error" in result:
             return f"Error creating node: {result['error']}"
@@ -448,11 +998,11 @@ def create_node(
         # Return a user-friendly message
         return f"Created {node_type} node at {result['path']}"
     except Exception as e:
-        logger.error(f"Error creating node: {str(e)}")
+        logger.error("Error creating node: %s", e)
         return f"Error creating node: {str(e)}"
 
 @mcp.tool()
-def modify_node(
+async def modify_node(
     ctx: Context,
     path: str,
     position: Optional[List[float]] = None,
@@ -476,23 +1026,22 @@ def modify_node(
     Information about the modified node.
     """
     try:
-        houdini = get_houdini_connection()
+        houdini = await get_houdini_connection()
         
         # Pass parameters to the Houdini command
-        params = {"path": path}
+        params = _without_none({
+            "path": path,
+            "position": position,
+            "color": color,
+            "name": name,
+            "bypass": bypass,
+            "display": display
+        })
         
-        if position is not None:
-            params["position"] = position
-        if color is not None:
-            params["color"] = color
         if name is not None:
-            params["name"] = name
-        if bypass is not None:
-            params["bypass"] = bypass
-        if display is not None:
-            params["display"] = display
+            _forget_node(path)  # The node is about to move to a new path
             
-        result = houdini.send_command("modify_node", params)
+        result = await houdini.send_command("modify_node", params)
         
         if "error" in result:
             return f"Error modifying node: {result['error']}"
@@ -513,11 +1062,11 @@ def modify_node(
         changes_str = ", ".join(changes)
         return f"Modified {changes_str} for node at {result['path']}"
     except Exception as e:
-        logger.error(f"Error modifying node: {str(e)}")
+        logger.error("Error modifying node: %s", e)
         return f"Error modifying node: {str(e)}"
 
 @mcp.tool()
-def delete_node(ctx: Context, path: str) -> str:
+async def delete_node(ctx: Context, path: str) -> str:
     """
     Delete a node from the Houdini network.
     
@@ -528,9 +1077,10 @@ def delete_node(ctx: Context, path: str) -> str:
     Confirmation of the deletion.
     """
     try:
-        houdini = get_houdini_connection()
+        houdini = await get_houdini_connection()
         
-        result = houdini.send_command("delete_node", {"path": path})
+        _forget_node(path)
+        result = await houdini.send_command("delete_node", {"path": path})
         
         if "error" in result:
             return f"Error deleting node: {result['error']}"
@@ -538,11 +1088,11 @@ def delete_node(ctx: Context, path: str) -> str:
         # Return a user-friendly message
         return f"Deleted node: {result['name']} at {result['path']}"
     except Exception as e:
-        logger.error(f"Error deleting node: {str(e)}")
+        logger.error("Error deleting node: %s", e)
         return f"Error deleting node: {str(e)}"
 
 @mcp.tool()
-def set_parameter(
+async def set_parameter(
     ctx: Context,
     node_path: str,
     parameter_name: str,
@@ -560,9 +1110,10 @@ def set_parameter(
     Confirmation of the parameter change.
     """
     try:
-        houdini = get_houdini_connection()
+        houdini = await get_houdini_connection()
         
-        result = houdini.send_command("set_parameter", {
+        _forget_node(node_path)
+        result = await houdini.send_command("set_parameter", {
             "node_path": node_path,
             "parameter_name": parameter_name,
             "value": value
@@ -574,11 +1125,11 @@ def set_parameter(
         # Return a user-friendly message
         return f"Set parameter {parameter_name} on {node_path} to {value}"
     except Exception as e:
-        logger.error(f"Error setting parameter: {str(e)}")
+        logger.error("Error setting parameter: %s", e)
         return f"Error setting parameter: {str(e)}"
 
 @mcp.tool()
-def connect_nodes(
+async def connect_nodes(
     ctx: Context,
     from_path: str,
     to_path: str,
@@ -598,9 +1149,9 @@ def connect_nodes(
     Confirmation of the connection.
     """
     try:
-        houdini = get_houdini_connection()
+        houdini = await get_houdini_connection()
         
-        result = houdini.send_command("connect_nodes", {
+        result = await houdini.send_command("connect_nodes", {
             "from_path": from_path,
             "to_path": to_path,
             "from_output": from_output,
@@ -615,11 +1166,11 @@ def connect_nodes(
         to_name = to_path.split("/")[-1]
         return f"Connected {from_name} (output {from_output}) to {to_name} (input {to_input})"
     except Exception as e:
-        logger.error(f"Error connecting nodes: {str(e)}")
+        logger.error("Error connecting nodes: %s", e)
         return f"Error connecting nodes: {str(e)}"
 
 @mcp.tool()
-def set_material(
+async def set_material(
     ctx: Context,
     node_path: str,
     material_type: str = "principledshader",
@@ -639,20 +1190,18 @@ def set_material(
     Confirmation of the material application.
     """
     try:
-        houdini = get_houdini_connection()
+        houdini = await get_houdini_connection()
         
         # Pass parameters to the Houdini command
-        params = {
+        params = _without_none({
             "node_path": node_path,
-            "material_type": material_type
-        }
-        
-        if material_name:
-            params["material_name"] = material_name
-        if parameters:
-            params["parameters"] = parameters
+            "material_type": material_type,
+            "material_name": material_name,
+            "parameters": parameters
+        })
             
-        result = houdini.send_command("set_material", params)
+        _forget_node(node_path)
+        result = await houdini.send_command("set_material", params)
         
         if "error" in result:
             return f"Error setting material: {result['error']}"
@@ -660,11 +1209,11 @@ def set_material(
         # Return a user-friendly message
         return f"Applied {material_type} material ({result['material_name']}) to {node_path}"
     except Exception as e:
-        logger.error(f"Error setting material: {str(e)}")
+        logger.error("Error setting material: %s", e)
         return f"Error setting material: {str(e)}"
 
 @mcp.tool()
-def execute_houdini_code(ctx: Context, code: str) -> str:
+async def execute_houdini_code(ctx: Context, code: str) -> str:
     """
     Execute arbitrary Python code in Houdini.
 
@@ -679,9 +1228,10 @@ def execute_houdini_code(ctx: Context, code: str) -> str:
     Captured stdout output and/or __result__ value, or confirmation.
     """
     try:
-        houdini = get_houdini_connection()
+        houdini = await get_houdini_connection()
 
-        result = houdini.send_command("execute_code", {"code": code})
+        _forget_all_param_info()
+        result = await houdini.send_command("execute_code", {"code": code}, timeout=_LONG_TIMEOUT)
 
         if "error" in result:
             return f"Error executing code: {result['error']}"
@@ -690,14 +1240,56 @@ def execute_houdini_code(ctx: Context, code: str) -> str:
         if result.get("output"):
             parts.append(f"Output:\n{result['output']}")
         if result.get("result") is not None:
-            parts.append(f"Result: {json.dumps(result['result'], indent=2)}")
+            parts.append(f"Result: {_json_text(result['result'])}")
         return "\n".join(parts)
     except Exception as e:
-        logger.error(f"Error executing code: {str(e)}")
+        logger.error("Error executing code: %s", e)
         return f"Error executing code: {str(e)}"
 
 @mcp.tool()
-def create_camera(
+async def run_batch(
+    ctx: Context,
+    commands: List[Dict[str, Any]],
+    stop_on_error: bool = True
+) -> str:
+    """
+    Run several Houdini commands in one round trip, as a single undo step.
+
+    Parameters:
+    - commands: List of {"type": <command>, "params": {...}} entries, using the
+      addon's command names (e.g. create_node, set_parameter, connect_nodes).
+      A parameter value of {"__ref": i} is replaced by the result of entry i
+      (0-based), and {"__ref": i, "key": "path"} by one field of it, e.g. to
+      connect a node created earlier in the same batch.
+    - stop_on_error: Stop at the first failing command (default: True)
+
+    Returns:
+    One line per command with its result or error.
+    """
+    try:
+        houdini = await get_houdini_connection()
+        _forget_all_param_info()
+        result = await houdini.send_command("batch", {
+            "commands": commands,
+            "stop_on_error": stop_on_error
+        }, timeout=_LONG_TIMEOUT)
+
+        lines = [f"Ran {result.get('completed', 0)} of {result.get('total', len(commands))} commands:"]
+        for index, (command, reply) in enumerate(zip(commands, result.get("results", [])), 1):
+            name = command.get("type", "?")
+            if reply.get("status") == "error":
+                lines.append(f"{index}. {name}: error: {reply.get('message', 'unknown error')}")
+            elif isinstance(reply.get("result"), dict) and "error" in reply["result"]:
+                lines.append(f"{index}. {name}: error: {reply['result']['error']}")
+            else:
+                lines.append(f"{index}. {name}: {_json_text(reply.get('result'))}")
+        return "\n".join(lines)
+    except Exception as e:
+        logger.error("Error running batch: %s", e)
+        return f"Error running batch: {str(e)}"
+
+@mcp.tool()
+async def create_camera(
     ctx: Context,
     parent_path: str = "/obj",
     name: Optional[str] = None,
@@ -717,19 +1309,17 @@ def create_camera(
     Information about the created camera.
     """
     try:
-        houdini = get_houdini_connection()
+        houdini = await get_houdini_connection()
         
         # Pass parameters to the Houdini command
-        params = {"parent_path": parent_path}
-        
-        if name:
-            params["name"] = name
-        if position:
-            params["position"] = position
-        if look_at:
-            params["look_at"] = look_at
+        params = _without_none({
+            "parent_path": parent_path,
+            "name": name,
+            "position": position,
+            "look_at": look_at
+        })
             
-        result = houdini.send_command("create_camera", params)
+        result = await houdini.send_command("create_camera", params)
         
         if "error" in result:
             return f"Error creating camera: {result['error']}"
@@ -742,11 +1332,11 @@ def create_camera(
             msg += f", looking at {look_at}"
         return msg
     except Exception as e:
-        logger.error(f"Error creating camera: {str(e)}")
+        logger.error("Error creating camera: %s", e)
         return f"Error creating camera: {str(e)}"
 
 @mcp.tool()
-def create_light(
+async def create_light(
     ctx: Context,
     light_type: str = "point",
     parent_path: str = "/obj",
@@ -768,22 +1358,18 @@ def create_light(
     Information about the created light.
     """
     try:
-        houdini = get_houdini_connection()
+        houdini = await get_houdini_connection()
         
         # Pass parameters to the Houdini command
-        params = {
+        params = _without_none({
             "light_type": light_type,
-            "parent_path": parent_path
-        }
-        
-        if name:
-            params["name"] = name
-        if position:
-            params["position"] = position
-        if parameters:
-            params["parameters"] = parameters
+            "parent_path": parent_path,
+            "name": name,
+            "position": position,
+            "parameters": parameters
+        })
             
-        result = houdini.send_command("create_light", params)
+        result = await houdini.send_command("create_light", params)
         
         if "error" in result:
             return f"Error creating light: {result['error']}"
@@ -791,11 +1377,11 @@ def create_light(
         # Return a user-friendly message
         return f"Created {light_type} light at {result['path']}"
     except Exception as e:
-        logger.error(f"Error creating light: {str(e)}")
+        logger.error("Error creating light: %s", e)
         return f"Error creating light: {str(e)}"
 
 @mcp.tool()
-def create_simulation(
+async def create_simulation(
     ctx: Context,
     sim_type: str,
     parent_path: str = "/obj",
@@ -815,20 +1401,17 @@ def create_simulation(
     Information about the created simulation network.
     """
     try:
-        houdini = get_houdini_connection()
+        houdini = await get_houdini_connection()
         
         # Pass parameters to the Houdini command
-        params = {
+        params = _without_none({
             "sim_type": sim_type,
-            "parent_path": parent_path
-        }
-        
-        if name:
-            params["name"] = name
-        if position:
-            params["position"] = position
+            "parent_path": parent_path,
+            "name": name,
+            "position": position
+        })
             
-        result = houdini.send_command("create_sim", params)
+        result = await houdini.send_command("create_sim", params)
         
         if "error" in result:
             return f"Error creating simulation: {result['error']}"
@@ -836,11 +1419,11 @@ def create_simulation(
         # Return a user-friendly message
         return f"Created {sim_type} simulation network at {result['path']}"
     except Exception as e:
-        logger.error(f"Error creating simulation: {str(e)}")
+        logger.error("Error creating simulation: %s", e)
         return f"Error creating simulation: {str(e)}"
 
 @mcp.tool()
-def run_simulation(
+async def run_simulation(
     ctx: Context,
     node_path: str,
     start_frame: int = 1,
@@ -860,14 +1443,15 @@ def run_simulation(
     Information about the simulation run.
     """
     try:
-        houdini = get_houdini_connection()
+        houdini = await get_houdini_connection()
         
-        result = houdini.send_command("run_simulation", {
+        result = await houdini.send_command("run_simulation", {
             "node_path": node_path,
             "start_frame": start_frame,
             "end_frame": end_frame,
             "save_to_disk": save_to_disk
-        })
+        }, timeout=max(_RESPONSE_TIMEOUT,
+                       (abs(end_frame - start_frame) + 1) * _SIM_FRAME_TIMEOUT))
         
         if "error" in result:
             return f"Error running simulation: {result['error']}"
@@ -878,16 +1462,28 @@ def run_simulation(
             msg += f"\nSaved cache to: {result['cache_path']}"
         return msg
     except Exception as e:
-        logger.error(f"Error running simulation: {str(e)}")
+        logger.error("Error running simulation: %s", e)
         return f"Error running simulation: {str(e)}"
 
+def _render_scene_message(result: Dict[str, Any], args: Dict[str, Any]) -> str:
+    msg = f"Rendered scene using {args['renderer']}"
+    if "file_path" in result:
+        msg += f"\nSaved output to: {result['file_path']}"
+    if "resolution" in result:
+        msg += f"\nResolution: {result['resolution'][0]}x{result['resolution'][1]}"
+    if "job_id" in result:
+        msg += f"\nStill rendering in the background as job {result['job_id']} (check with get_job_status)"
+    return msg
+
 @mcp.tool()
+@houdini_tool("render_scene", _render_scene_message, "rendering scene", timeout=_LONG_TIMEOUT)
 def render_scene(
     ctx: Context,
     output_path: Optional[str] = None,
     renderer: str = "mantra",
     resolution: Optional[List[int]] = None,
-    camera_path: Optional[str] = None
+    camera_path: Optional[str] = None,
+    background: bool = False
 ) -> str:
     """
     Render the current Houdini scene.
@@ -897,45 +1493,82 @@ def render_scene(
     - renderer: Renderer to use (mantra, karma, arnold, redshift, renderman)
     - resolution: Optional [width, height] resolution override
     - camera_path: Optional path to the camera to use for rendering
+    - background: Return immediately and render in the background;
+      check on it with get_job_status (default: False)
     
     Returns:
     Information about the render.
     """
+
+@mcp.tool()
+async def render_scene_multi(
+    ctx: Context,
+    cameras: List[str],
+    output_template: Optional[str] = None,
+    renderer: str = "mantra",
+    resolution: Optional[List[int]] = None
+) -> str:
+    """
+    Render the current frame from several cameras in one call.
+
+    The views are rendered one after another, each a full render, so this
+    takes about as long as one render_scene call per camera; it only saves
+    the round trips.
+    
+    Parameters:
+    - cameras: Paths of the cameras to render from
+    - output_template: Optional output path pattern; {camera} is replaced by the
+      camera name and {index} by its position in the list
+    - renderer: Renderer to use (mantra, karma, arnold, redshift, renderman)
+    - resolution: Optional [width, height] resolution override
+    
+    Returns:
+    The image written for each camera.
+    """
     try:
-        houdini = get_houdini_connection()
-        
-        # Pass parameters to the Houdini command
-        params = {"renderer": renderer}
+        houdini = await get_houdini_connection()
         
-        if output_path:
-            params["output_path"] = output_path
-        if resolution:
-            params["resolution"] = resolution
-        if camera_path:
-            params["camera_path"] = camera_path
+        params = _without_none({
+            "cameras": cameras,
+            "renderer": renderer,
+            "output_template": output_template,
+            "resolution": resolution
+        })
             
-        result = houdini.send_command("render_scene", params)
+        result = await houdini.send_command("render_scene_multi", params, timeout=_LONG_TIMEOUT)
         
         if "error" in result:
             return f"Error rendering scene: {result['error']}"
         
-        # Return a user-friendly message
-        msg = f"Rendered scene using {renderer}"
-        if "file_path" in result:
-            msg += f"\nSaved output to: {result['file_path']}"
-        if "resolution" in result:
-            msg += f"\nResolution: {result['resolution'][0]}x{result['resolution'][1]}"
+        msg = f"Rendered {len(result['images'])} views using {renderer}"
+        for image in result["images"]:
+            msg += f"\n{image['camera']}: {image['file_path']}"
         return msg
     except Exception as e:
-        logger.error(f"Error rendering scene: {str(e)}")
+        logger.error("Error rendering scene: %s", e)
         return f"Error rendering scene: {str(e)}"
 
+def _export_message(format_name: str):
+    """Build the format_ok callback shared by the export tools."""
+    def message(result: Dict[str, Any], args: Dict[str, Any]) -> str:
+        msg = f"Exported {args['node_path']} to {format_name}"
+        if "file_path" in result:
+            msg += f"\nSaved to: {result['file_path']}"
+        if args["animation"]:
+            msg += "\nIncluded animation data"
+        if "job_id" in result:
+            msg += f"\nRunning in the background as job {result['job_id']} (check with get_job_status)"
+        return msg
+    return message
+
 @mcp.tool()
+@houdini_tool("export_fbx", _export_message("FBX"), "exporting to FBX", timeout=_LONG_TIMEOUT)
 def export_fbx(
     ctx: Context,
     node_path: str,
     file_path: Optional[str] = None,
-    animation: bool = False
+    animation: bool = False,
+    background: bool = False
 ) -> str:
     """
     Export a node to FBX format.
@@ -944,39 +1577,16 @@ def export_fbx(
     - node_path: Path to the node to export
     - file_path: Optional path to save the FBX file
     - animation: Whether to export animation (default: False)
+    - background: Return immediately and write the file in the background;
+      check on it with get_job_status (default: False)
     
     Returns:
     Information about the export.
     """
-    try:
-        houdini = get_houdini_connection()
-        
-        # Pass parameters to the Houdini command
-        params = {
-            "node_path": node_path,
-            "animation": animation
-        }
-        
-        if file_path:
-            params["file_path"] = file_path
-            
-        result = houdini.send_command("export_fbx", params)
-        
-        if "error" in result:
-            return f"Error exporting to FBX: {result['error']}"
-        
-        # Return a user-friendly message
-        msg = f"Exported {node_path} to FBX"
-        if "file_path" in result:
-            msg += f"\nSaved to: {result['file_path']}"
-        if animation:
-            msg += "\nIncluded animation data"
-        return msg
-    except Exception as e:
-        logger.error(f"Error exporting to FBX: {str(e)}")
-        return f"Error exporting to FBX: {str(e)}"
 
 @mcp.tool()
+@houdini_tool("layout_network", lambda result, args: f"Auto-laid out nodes in {result['path']}",
+              "laying out network")
 def layout_network(ctx: Context, path: str) -> str:
     """
     Auto-layout nodes in a Houdini network.
@@ -987,17 +1597,10 @@ def layout_network(ctx: Context, path: str) -> str:
     Returns:
     Confirmation of the layout operation.
     """
-    try:
-        houdini = get_houdini_connection()
-        result = houdini.send_command("layout_network", {"path": path})
-        if "error" in result:
-            return f"Error laying out network: {result['error']}"
-        return f"Auto-laid out nodes in {result['path']}"
-    except Exception as e:
-        logger.error(f"Error laying out network: {str(e)}")
-        return f"Error laying out network: {str(e)}"
 
 @mcp.tool()
+@houdini_tool("create_subnet", lambda result, args: f"Created subnet at {result['path']}",
+              "creating subnet")
 def create_subnet(
     ctx: Context,
     parent_path: str,
@@ -1017,23 +1620,9 @@ def create_subnet(
     Returns:
     Information about the created subnet.
     """
-    try:
-        houdini = get_houdini_connection()
-        params = {"parent_path": parent_path, "node_type": node_type}
-        if name:
-            params["name"] = name
-        if position:
-            params["position"] = position
-        result = houdini.send_command("create_subnet", params)
-        if "error" in result:
-            return f"Error creating subnet: {result['error']}"
-        return f"Created subnet at {result['path']}"
-    except Exception as e:
-        logger.error(f"Error creating subnet: {str(e)}")
-        return f"Error creating subnet: {str(e)}"
 
 @mcp.tool()
-def create_digital_asset(
+async def create_digital_asset(
     ctx: Context,
     node_path: str,
     name: str,
@@ -1053,13 +1642,15 @@ def create_digital_asset(
     Information about the created HDA.
     """
     try:
-        houdini = get_houdini_connection()
-        params = {"node_path": node_path, "name": name}
-        if label:
-            params["label"] = label
-        if save_path:
-            params["save_path"] = save_path
-        result = houdini.send_command("create_digital_asset", params)
+        houdini = await get_houdini_connection()
+        params = _without_none({
+            "node_path": node_path,
+            "name": name,
+            "label": label,
+            "save_path": save_path
+        })
+        _forget_node(node_path)
+        result = await houdini.send_command("create_digital_asset", params)
         if "error" in result:
             return f"Error creating digital asset: {result['error']}"
         msg = f"Created HDA '{name}' at {result['path']}"
@@ -1067,11 +1658,11 @@ def create_digital_asset(
             msg += f"\nSaved to: {result['hda_file']}"
         return msg
     except Exception as e:
-        logger.error(f"Error creating digital asset: {str(e)}")
+        logger.error("Error creating digital asset: %s", e)
         return f"Error creating digital asset: {str(e)}"
 
 @mcp.tool()
-def get_parameter_info(
+async def get_parameter_info(
     ctx: Context,
     node_path: str,
     parameter_name: Optional[str] = None
@@ -1087,19 +1678,27 @@ def get_parameter_info(
     JSON-formatted parameter details.
     """
     try:
-        houdini = get_houdini_connection()
-        params = {"node_path": node_path}
-        if parameter_name:
-            params["parameter_name"] = parameter_name
-        result = houdini.send_command("get_parameter_info", params)
+        houdini = await get_houdini_connection()
+        cached = _cached_param_info(node_path, parameter_name)
+        if cached is not None:
+            return cached
+        params = _without_none({
+            "node_path": node_path,
+            "parameter_name": parameter_name
+        })
+        result = await houdini.send_command("get_parameter_info", params)
         if "error" in result:
             return f"Error getting parameter info: {result['error']}"
-        return json.dumps(result, indent=2)
+        text = _json_text(result)
+        _remember_param_info(node_path, parameter_name, text)
+        return text
     except Exception as e:
-        logger.error(f"Error getting parameter info: {str(e)}")
+        logger.error("Error getting parameter info: %s", e)
         return f"Error getting parameter info: {str(e)}"
 
 @mcp.tool()
+@houdini_tool("save_hip", lambda result, args: f"Saved scene to: {result['file_path']}",
+              "saving scene", timeout=_LONG_TIMEOUT)
 def save_hip(ctx: Context, file_path: Optional[str] = None) -> str:
     """
     Save the current Houdini scene file.
@@ -1110,20 +1709,10 @@ def save_hip(ctx: Context, file_path: Optional[str] = None) -> str:
     Returns:
     Confirmation with the saved file path.
     """
-    try:
-        houdini = get_houdini_connection()
-        params = {}
-        if file_path:
-            params["file_path"] = file_path
-        result = houdini.send_command("save_hip", params)
-        if "error" in result:
-            return f"Error saving scene: {result['error']}"
-        return f"Saved scene to: {result['file_path']}"
-    except Exception as e:
-        logger.error(f"Error saving scene: {str(e)}")
-        return f"Error saving scene: {str(e)}"
 
 @mcp.tool()
+@houdini_tool("load_hip", lambda result, args: f"Loaded scene: {result['name']} from {result['file_path']}",
+              "loading scene", timeout=_LONG_TIMEOUT)
 def load_hip(ctx: Context, file_path: str) -> str:
     """
     Load a Houdini scene file. Automatically backs up unsaved changes.
@@ -1134,22 +1723,15 @@ def load_hip(ctx: Context, file_path: str) -> str:
     Returns:
     Confirmation with the loaded file info.
     """
-    try:
-        houdini = get_houdini_connection()
-        result = houdini.send_command("load_hip", {"file_path": file_path})
-        if "error" in result:
-            return f"Error loading scene: {result['error']}"
-        return f"Loaded scene: {result['name']} from {result['file_path']}"
-    except Exception as e:
-        logger.error(f"Error loading scene: {str(e)}")
-        return f"Error loading scene: {str(e)}"
 
 @mcp.tool()
+@houdini_tool("export_abc", _export_message("Alembic"), "exporting to Alembic", timeout=_LONG_TIMEOUT)
 def export_abc(
     ctx: Context,
     node_path: str,
     file_path: Optional[str] = None,
-    animation: bool = False
+    animation: bool = False,
+    background: bool = False
 ) -> str:
     """
     Export a node to Alembic (.abc) format.
@@ -1158,34 +1740,21 @@ def export_abc(
     - node_path: Path to the node to export
     - file_path: Optional path for the output file
     - animation: Whether to export animation (default: False)
+    - background: Return immediately and write the file in the background;
+      check on it with get_job_status (default: False)
 
     Returns:
     Information about the export.
     """
-    try:
-        houdini = get_houdini_connection()
-        params = {"node_path": node_path, "animation": animation}
-        if file_path:
-            params["file_path"] = file_path
-        result = houdini.send_command("export_abc", params)
-        if "error" in result:
-            return f"Error exporting to Alembic: {result['error']}"
-        msg = f"Exported {node_path} to Alembic"
-        if "file_path" in result:
-            msg += f"\nSaved to: {result['file_path']}"
-        if animation:
-            msg += "\nIncluded animation data"
-        return msg
-    except Exception as e:
-        logger.error(f"Error exporting to Alembic: {str(e)}")
-        return f"Error exporting to Alembic: {str(e)}"
 
 @mcp.tool()
+@houdini_tool("export_usd", _export_message("USD"), "exporting to USD", timeout=_LONG_TIMEOUT)
 def export_usd(
     ctx: Context,
     node_path: str,
     file_path: Optional[str] = None,
-    animation: bool = False
+    animation: bool = False,
+    background: bool = False
 ) -> str:
     """
     Export a node to USD format.
@@ -1194,34 +1763,119 @@ def export_usd(
     - node_path: Path to the node to export
     - file_path: Optional path for the output file
     - animation: Whether to export animation (default: False)
+    - background: Return immediately and write the file in the background;
+      check on it with get_job_status (default: False)
 
     Returns:
     Information about the export.
     """
+
+@mcp.tool()
+async def get_job_status(ctx: Context, job_id: str) -> str:
+    """
+    Check on a render or export started with background=True.
+
+    Parameters:
+    - job_id: The job id reported by render_scene, render_cop or an export tool
+
+    Returns:
+    Whether the job is still running, finished, or failed.
+    """
     try:
-        houdini = get_houdini_connection()
-        params = {"node_path": node_path, "animation": animation}
-        if file_path:
-            params["file_path"] = file_path
-        result = houdini.send_command("export_usd", params)
+        houdini = await get_houdini_connection()
+        result = await houdini.send_command("get_job_status", {"job_id": job_id})
         if "error" in result:
-            return f"Error exporting to USD: {result['error']}"
-        msg = f"Exported {node_path} to USD"
-        if "file_path" in result:
-            msg += f"\nSaved to: {result['file_path']}"
-        if animation:
-            msg += "\nIncluded animation data"
-        return msg
+            return f"Error checking job: {result['error']}"
+        return _job_status_message(job_id, result)
     except Exception as e:
-        logger.error(f"Error exporting to USD: {str(e)}")
-        return f"Error exporting to USD: {str(e)}"
+        logger.error("Error checking job: %s", e)
+        return f"Error checking job: {str(e)}"
+
+# Polling intervals for wait_for_job, in seconds: quick at first for short
+# jobs, backing off for long renders
+_JOB_POLL_FIRST = 0.1
+_JOB_POLL_MAX = 2.0
+
+@mcp.tool()
+async def wait_for_job(ctx: Context, job_id: str, timeout: float = 300.0) -> str:
+    """
+    Wait for a render or export started with background=True to finish.
+
+    Other tools keep working while this waits, and Houdini is only asked
+    for the job's status now and then.
+
+    Parameters:
+    - job_id: The job id reported by render_scene, render_cop or an export tool
+    - timeout: Most seconds to wait before reporting the job as still running (default: 300)
+
+    Returns:
+    Whether the job finished or failed, or that it is still running.
+    """
+    try:
+        deadline = time.monotonic() + timeout
+        interval = _JOB_POLL_FIRST
+        while True:
+            houdini = await get_houdini_connection()
+            result = await houdini.send_command("get_job_status", {"job_id": job_id})
+            if "error" in result:
+                return f"Error waiting for job: {result['error']}"
+            remaining = deadline - time.monotonic()
+            if result.get("status") != "running" or remaining <= 0:
+                return _job_status_message(job_id, result)
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * 2, _JOB_POLL_MAX)
+    except Exception as e:
+        logger.error("Error waiting for job: %s", e)
+        return f"Error waiting for job: {str(e)}"
+
+def _job_status_message(job_id: str, result: Dict[str, Any]) -> str:
+    status = result.get("status")
+    if status == "running":
+        return f"Job {job_id} is still running"
+    if status == "error":
+        return f"Job {job_id} failed: {result.get('message', 'unknown error')}"
+    msg = f"Job {job_id} finished"
+    if result.get("result"):
+        msg += f" ({result['result']})"
+    return msg
+
+def _render_cop_response(result: Dict[str, Any], args: Dict[str, Any]):
+    node_path = args["node_path"]
+    if "job_id" in result:
+        return (f"Rendering COP node {node_path} to {result.get('file_path', '')} "
+                f"in the background as job {result['job_id']} (check with get_job_status)")
+
+    file_path = result.get("file_path", "")
+    is_temp = result.get("is_temp", False)
+
+    parts = [f"Rendered COP node: {node_path}"]
+    if result.get("method"):
+        parts.append(f"Method: {result['method']}")
+    parts.append(f"Frame: {result.get('frame', '?')}")
+    if not is_temp:
+        parts.append(f"Saved to: {file_path}")
+
+    msg = " | ".join(parts)
+
+    response = []
+    if os.path.exists(file_path):
+        response.append(Image(path=file_path))
+        if is_temp:
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+    response.append(msg)
+    return response
 
 @mcp.tool()
+@houdini_tool("render_cop", _render_cop_response, "rendering COP", timeout=_LONG_TIMEOUT)
 def render_cop(
     ctx: Context,
     node_path: str,
     output_path: Optional[str] = None,
-    frame: Optional[int] = None
+    frame: Optional[int] = None,
+    background: bool = False
 ) -> list:
     """
     Render a COP (compositing) node output to an image file.
@@ -1230,54 +1884,15 @@ def render_cop(
     - node_path: Path to the COP node to render
     - output_path: Optional path to save the image (default: auto temp file, cleaned up after viewing)
     - frame: Optional frame number to render (default: current frame)
+    - background: Return immediately and write the image in the background;
+      check on it with get_job_status. Needs output_path (default: False)
 
     Returns:
     The rendered image along with render info.
     """
-    try:
-        houdini = get_houdini_connection()
-
-        params = {"node_path": node_path}
-
-        if output_path:
-            params["output_path"] = output_path
-        if frame is not None:
-            params["frame"] = frame
-
-        result = houdini.send_command("render_cop", params)
-
-        if "error" in result:
-            return f"Error rendering COP: {result['error']}"
-
-        file_path = result.get("file_path", "")
-        is_temp = result.get("is_temp", False)
-
-        parts = [f"Rendered COP node: {node_path}"]
-        if result.get("method"):
-            parts.append(f"Method: {result['method']}")
-        parts.append(f"Frame: {result.get('frame', '?')}")
-        if not is_temp:
-            parts.append(f"Saved to: {file_path}")
-
-        msg = " | ".join(parts)
-
-        response = []
-        if os.path.exists(file_path):
-            response.append(Image(path=file_path))
-            if is_temp:
-                try:
-                    os.remove(file_path)
-                except OSError:
-                    pass
-        response.append(msg)
-        return response
-
-    except Exception as e:
-        logger.error(f"Error rendering COP: {str(e)}")
-        return f"Error rendering COP: {str(e)}"
 
 @mcp.tool()
-def list_houdini_instances(ctx: Context) -> str:
+async def list_houdini_instances(ctx: Context) -> str:
     """
     List all running Houdini instances discovered via port files.
 
@@ -1299,8 +1914,8 @@ def list_houdini_instances(ctx: Context) -> str:
 
         # Determine currently connected port
         connected_port = None
-        if _houdini_connection and _houdini_connection.sock:
-            connected_port = _houdini_connection.port
+        if _active_pool in _pools:
+            connected_port = _active_pool[1]
 
         lines = [f"Found {len(instances)} Houdini instance(s):\n"]
         for inst in instances:
@@ -1319,12 +1934,12 @@ def list_houdini_instances(ctx: Context) -> str:
 
         return "\n".join(lines)
     except Exception as e:
-        logger.error(f"Error listing instances: {str(e)}")
+        logger.error("Error listing instances: %s", e)
         return f"Error listing Houdini instances: {str(e)}"
 
 
 @mcp.tool()
-def connect_to_houdini(ctx: Context, port: int) -> str:
+async def connect_to_houdini(ctx: Context, port: int) -> str:
     """
     Switch the MCP server's connection to a specific Houdini instance.
 
@@ -1336,32 +1951,25 @@ def connect_to_houdini(ctx: Context, port: int) -> str:
     Returns:
     Scene info from the newly connected Houdini instance, confirming success.
     """
-    global _houdini_connection, _target_port
+    global _target_port
 
     try:
-        # Validate that the port corresponds to a known instance
-        instances = _discover_instances()
-        known_ports = {inst['port'] for inst in instances}
-
-        if port not in known_ports:
+        # Try the port itself; the port files are only scanned to explain
+        # a failure. Switching keeps the old instance's pool warm for
+        # switching back, and a failed attempt leaves it active.
+        houdini = await _open_pool(port)
+        if houdini is None:
+            known_ports = {inst['port'] for inst in _discover_instances()}
             available = ", ".join(str(p) for p in sorted(known_ports)) if known_ports else "none"
             return (
                 f"No Houdini instance found on port {port}.\n"
                 f"Available ports: {available}"
             )
 
-        # Disconnect current connection
-        if _houdini_connection:
-            try:
-                _houdini_connection.disconnect()
-            except Exception:
-                pass
-            _houdini_connection = None
-
-        # Set target and connect
         _target_port = port
-        houdini = get_houdini_connection()
-        result = houdini.send_command("get_scene_info")
+        result = await houdini.send_command("get_scene_info")
+        # The switch may follow instances starting or exiting; list afresh
+        _invalidate_instance_cache()
 
         return (
             f"Connected to Houdini on port {port}.\n"
@@ -1370,15 +1978,64 @@ def connect_to_houdini(ctx: Context, port: int) -> str:
             f"Frame: {result.get('current_frame', '?')}"
         )
     except Exception as e:
-        logger.error(f"Error connecting to Houdini on port {port}: {str(e)}")
+        logger.error("Error connecting to Houdini on port %s: %s", port, e)
         return f"Error connecting to port {port}: {str(e)}"
 
 
+def _screenshot_response(result: Dict[str, Any]) -> list:
+    """Turn a finished screenshot reply into the image plus a context line."""
+    file_path = result.get("file_path", "")
+    is_temp = result.get("is_temp", False)
+
+    # Build viewer context summary
+    viewer = result.get("viewer", {})
+    parts = []
+    if viewer.get("tab_name"):
+        parts.append(f"Viewer: {viewer['tab_name']}")
+    if viewer.get("viewport_type"):
+        parts.append(f"Viewport: {viewer['viewport_type']}")
+    if viewer.get("displayed_node"):
+        parts.append(f"Displayed node: {viewer['displayed_node']}")
+    if viewer.get("network_path"):
+        parts.append(f"Network: {viewer['network_path']}")
+    if viewer.get("camera"):
+        parts.append(f"Camera: {viewer['camera']}")
+    parts.append(f"Frame: {result.get('frame', '?')}")
+    if not is_temp:
+        parts.append(f"Saved to: {file_path}")
+
+    context_msg = " | ".join(parts)
+
+    # Return image inline + context, then clean up temp file
+    response = []
+    if os.path.exists(file_path):
+        response.append(Image(path=file_path))
+        # Auto-cleanup temp files after reading
+        if is_temp:
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass  # best-effort cleanup
+    response.append(context_msg)
+    return response
+
+def _screenshot_viewport_response(result: Dict[str, Any], args: Dict[str, Any]):
+    if not result.get("success"):
+        return f"Screenshot failed: {result.get('error', 'unknown error')}"
+
+    if result.get("pending"):
+        return (f"Screenshot is being captured to {result['file_path']}; "
+                f"call check_screenshot with that path to get the image")
+
+    return _screenshot_response(result)
+
 @mcp.tool()
+@houdini_tool("screenshot_viewport", _screenshot_viewport_response, "taking screenshot")
 def screenshot_viewport(
     ctx: Context,
     output_path: Optional[str] = None,
-    viewer_name: Optional[str] = None
+    viewer_name: Optional[str] = None,
+    background: bool = False
 ) -> list:
     """
     Take a screenshot of the current Houdini viewport.
@@ -1386,66 +2043,41 @@ def screenshot_viewport(
     Parameters:
     - output_path: Optional path to save the screenshot (default: auto temp file, cleaned up after viewing)
     - viewer_name: Optional viewer tab name to capture (default: first scene viewer found)
+    - background: Return straight away while Houdini captures the frame;
+      fetch the image with check_screenshot (default: False)
 
     Returns:
     The screenshot image along with viewer context info (viewer name, viewport type,
     displayed node, network path, camera).
     """
-    try:
-        houdini = get_houdini_connection()
 
-        params = {}
-        if output_path:
-            params["output_path"] = output_path
-        if viewer_name:
-            params["viewer_name"] = viewer_name
+@mcp.tool()
+async def check_screenshot(ctx: Context, file_path: str) -> list:
+    """
+    Fetch a screenshot started with screenshot_viewport(background=True).
+
+    Parameters:
+    - file_path: The path reported by screenshot_viewport
 
-        result = houdini.send_command("screenshot_viewport", params)
+    Returns:
+    The screenshot image and viewer context once it is written, or a note
+    that it is still being captured.
+    """
+    try:
+        houdini = await get_houdini_connection()
+        result = await houdini.send_command("check_screenshot", {"file_path": file_path})
 
         if "error" in result:
             return f"Error taking screenshot: {result['error']}"
 
-        if not result.get("success"):
-            return f"Screenshot failed: {result.get('error', 'unknown error')}"
-
-        file_path = result.get("file_path", "")
-        is_temp = result.get("is_temp", False)
-
-        # Build viewer context summary
-        viewer = result.get("viewer", {})
-        parts = []
-        if viewer.get("tab_name"):
-            parts.append(f"Viewer: {viewer['tab_name']}")
-        if viewer.get("viewport_type"):
-            parts.append(f"Viewport: {viewer['viewport_type']}")
-        if viewer.get("displayed_node"):
-            parts.append(f"Displayed node: {viewer['displayed_node']}")
-        if viewer.get("network_path"):
-            parts.append(f"Network: {viewer['network_path']}")
-        if viewer.get("camera"):
-            parts.append(f"Camera: {viewer['camera']}")
-        parts.append(f"Frame: {result.get('frame', '?')}")
-        if not is_temp:
-            parts.append(f"Saved to: {file_path}")
-
-        context_msg = " | ".join(parts)
-
-        # Return image inline + context, then clean up temp file
-        response = []
-        if os.path.exists(file_path):
-            response.append(Image(path=file_path))
-            # Auto-cleanup temp files after reading
-            if is_temp:
-                try:
-                    os.remove(file_path)
-                except OSError:
-                    pass  # best-effort cleanup
-        response.append(context_msg)
-        return response
+        if result.get("pending"):
+            return f"Screenshot {file_path} is still being captured"
+
+        return _screenshot_response(result)
 
     except Exception as e:
-        logger.error(f"Error taking screenshot: {str(e)}")
-        return f"Error taking screenshot: {str(e)}"
+        logger.error("Error checking screenshot: %s", e)
+        return f"Error checking screenshot: {str(e)}"
 
 @mcp.prompt()
 def modeling_strategy() -> str: